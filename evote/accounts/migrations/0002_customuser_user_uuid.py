@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+import utils.generate_utils
+from utils.migration_utils import copy_uuid_column
+
+
+def copy_user_ids(apps, schema_editor):
+    copy_uuid_column(apps, schema_editor, 'accounts', 'CustomUser', 'user_id', 'user_uuid')
+
+
+class Migration(migrations.Migration):
+    # Batches commit one at a time so a large table is never locked for the whole copy.
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='user_uuid',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.RunPython(copy_user_ids, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='user_id',
+        ),
+        migrations.RenameField(
+            model_name='customuser',
+            old_name='user_uuid',
+            new_name='user_id',
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='user_id',
+            field=models.UUIDField(default=utils.generate_utils.generate_ids, unique=True),
+        ),
+    ]
@@ -42,7 +42,7 @@ class CustomUser(AbstractBaseUser,PermissionsMixin):
         
     role = models.CharField(max_length=20, choices=Roles.choices, default=Roles.ORGANIZER, blank=True, null=True)
     email = models.EmailField(verbose_name='email address', max_length=255, unique=True, null=True, blank=True)
-    user_id = models.CharField(default=generate_ids, unique=True)
+    user_id = models.UUIDField(default=generate_ids, unique=True)
     username = models.CharField(max_length=255, unique=True)
     phone_number = models.CharField(max_length=20, unique=True, null=True, blank=True)
     date_created = models.DateTimeField(auto_now_add=True)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -24,10 +25,80 @@ SECRET_KEY = 'django-insecure-+x&*z6y)n*hw#udgo!mueoyr@w$ag2=)5#hm8+&65(7xf(tg&a
 
 PAYSTACK_SECRET_KEY = 'sk_test_6c0cb2d45311c03b7476c5e2a061fe2cdd9f5c6a'
 PAYSTACK_PUBLIC_KEY = 'pk_test_80eebac412eca3fa2a4da650c1d677e93f1a9bb7'
+# Point this at `manage.py paystack_sim` to run payment flows offline.
+PAYSTACK_BASE_URL = os.environ.get('PAYSTACK_BASE_URL', 'https://api.paystack.co')
+PAYSTACK_TIMEOUT = float(os.environ.get('PAYSTACK_TIMEOUT', '10'))
+# Overrides for the Paystack circuit breaker defaults in organizer/paystack.py,
+# e.g. {'FAILURE_RATE': 0.5, 'SLOW_CALL_SECONDS': 5, 'RESET_SECONDS': 30}.
+PAYSTACK_CIRCUIT_BREAKER = {}
+# Identical payment initializations (phone, contestant, quantity) within this window reuse the first one.
+PAYMENT_INIT_DEDUP_SECONDS = int(os.environ.get('PAYMENT_INIT_DEDUP_SECONDS', '120'))
+# Parallel Paystack lookups per batch verification request.
+PAYMENT_VERIFY_CONCURRENCY = int(os.environ.get('PAYMENT_VERIFY_CONCURRENCY', '8'))
+
+# Versioned per-event cache for event detail, contestant lists and contestant cards.
+# EVENT_CACHE_ENABLED=0 bypasses it and reads straight from the database.
+EVENT_CACHE_ENABLED = os.environ.get('EVENT_CACHE_ENABLED', '1') == '1'
+EVENT_CACHE_TIMEOUT = int(os.environ.get('EVENT_CACHE_TIMEOUT', '300'))
+
+# Key for signing vote receipts; defaults to SECRET_KEY (and SECRET_KEY_FALLBACKS) when unset.
+RECEIPT_SIGNING_KEY = os.environ.get('RECEIPT_SIGNING_KEY', '')
+
+# Burst-voting detector (organizer/fraud.py): an IP or phone number recording
+# FRAUD_VOTES_PER_WINDOW votes for one event within FRAUD_WINDOW_SECONDS is flagged for review.
+FRAUD_DETECTION_ENABLED = os.environ.get('FRAUD_DETECTION_ENABLED', '1') == '1'
+FRAUD_VOTES_PER_WINDOW = int(os.environ.get('FRAUD_VOTES_PER_WINDOW', '60'))
+FRAUD_WINDOW_SECONDS = int(os.environ.get('FRAUD_WINDOW_SECONDS', '300'))
+
+# Organizer dashboards are recomputed at most once per this many seconds per event.
+DASHBOARD_CACHE_SECONDS = int(os.environ.get('DASHBOARD_CACHE_SECONDS', '5'))
+
+# Request/DB/Paystack metrics, scraped from /metrics/ with "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+# Set when running several worker processes: each writes its metrics to a file
+# here and /metrics/ reports their sum. Empty the directory before (re)starting.
+METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR', '')
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# Swagger UI, ReDoc and the schema at /, /redoc/ and /swagger.json. Off by default
+# without DEBUG, so production workers never import drf_yasg (see utils/apidocs.py).
+API_DOCS_ENABLED = os.environ.get('API_DOCS_ENABLED', '1' if DEBUG else '0') == '1'
+
+# Cache backend, selected with CACHE_BACKEND and CACHE_LOCATION. Event cache versions,
+# payment dedup entries, fraud counters and stampede locks must be shared by every
+# worker and rely on atomic incr/add, which only redis and memcached provide; the
+# default is redis. locmem (per process, the DEBUG default) and file (shared on one
+# host, non-atomic) are for development only.
+_CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+}
+_CACHE_LOCATIONS = {
+    'locmem': '',
+    'file': str(BASE_DIR / 'cache'),
+    'redis': 'redis://127.0.0.1:6379/1',
+    'memcached': '127.0.0.1:11211',
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem' if DEBUG else 'redis')
+CACHES = {
+    'default': {
+        'BACKEND': _CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.environ.get('CACHE_LOCATION', _CACHE_LOCATIONS[CACHE_BACKEND]),
+        # Every write passes its own timeout. None keeps incr() on locmem/file,
+        # which rewrites the key, from giving version keys a 300 s expiry.
+        'TIMEOUT': None,
+        # locmem and file evict at random past MAX_ENTRIES (300 by default).
+        'OPTIONS': {} if CACHE_BACKEND in ('redis', 'memcached') else {
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', '100000')),
+        },
+    }
+}
+
 ALLOWED_HOSTS = []
 
 
@@ -48,7 +119,12 @@ INSTALLED_APPS = [
     'organizer'
 ]
 
+if not API_DOCS_ENABLED:
+    INSTALLED_APPS.remove('drf_yasg')
+
 MIDDLEWARE = [
+    'organizer.middleware.RequestMetricsMiddleware',
+    'organizer.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -76,8 +152,21 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson-backed; both fall back to DRF's stdlib json classes when orjson is not installed.
+    'DEFAULT_RENDERER_CLASSES': (
+        'organizer.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'organizer.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
+# Responses at least this large are gzip- or brotli-compressed when the client accepts it.
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESSION_MIN_BYTES', '1024'))
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -116,10 +205,29 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Transactions take the write lock when they begin and wait for it, instead
+        # of failing with "database is locked" when concurrent writers upgrade.
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
     }
 }
 
 
+# Final results are snapshotted this long after an event's end_date, leaving time
+# for in-window payments to be verified; later settlements are refused.
+RESULTS_FINALIZE_GRACE_SECONDS = int(os.environ.get('RESULTS_FINALIZE_GRACE_SECONDS', '3600'))
+
+# Votes and payments of events closed longer than ARCHIVE_RETENTION_DAYS are moved
+# to compressed NDJSON segments under ARCHIVE_ROOT by `manage.py archive_events`.
+ARCHIVE_ROOT = Path(os.environ.get('ARCHIVE_ROOT', BASE_DIR / 'archive'))
+ARCHIVE_RETENTION_DAYS = int(os.environ.get('ARCHIVE_RETENTION_DAYS', '90'))
+
+# Pre-rendered public JSON for each event (details, contestant cards, standings),
+# written under STATIC_PUBLISH_ROOT for nginx or a CDN to serve; see organizer/publishing.py.
+STATIC_PUBLISH_ENABLED = os.environ.get('STATIC_PUBLISH_ENABLED', '0') == '1'
+STATIC_PUBLISH_ROOT = Path(os.environ.get('STATIC_PUBLISH_ROOT', BASE_DIR / 'public'))
+STATIC_PUBLISH_DEBOUNCE_SECONDS = float(os.environ.get('STATIC_PUBLISH_DEBOUNCE_SECONDS', '2'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -14,38 +14,64 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from functools import cache
+
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path,re_path, include
 from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from organizer.views import MetricsView
+
+
+@cache
+def _schema_view():
+   from drf_yasg import openapi
+   from drf_yasg.views import get_schema_view
+
+   return get_schema_view(
+      openapi.Info(
+         title="Voting API",
+         default_version='v1',
+         description="API documentation for a voting service",
+         license=openapi.License(name="BSD License"),
+      ),
+      public=True,
+      permission_classes=(permissions.AllowAny,),
+      patterns=[
+            path('api/users/', include('accounts.urls')),  # Include your app's URLs here
+            path('api/organizer/', include('organizer.urls')),  # Include your app's URLs here
+       ],
+       urlconf='evote.urls',  # Specify the URL configuration module
+       authentication_classes=(JWTAuthentication,),
+
+   )
 
 
-schema_view = get_schema_view(
-   openapi.Info(
-      title="Voting API",
-      default_version='v1',
-      description="API documentation for a voting service",
-      license=openapi.License(name="BSD License"),
-   ),
-   public=True,
-   permission_classes=(permissions.AllowAny,),
-   patterns=[
-         path('api/users/', include('accounts.urls')),  # Include your app's URLs here
-         path('api/organizer/', include('organizer.urls')),  # Include your app's URLs here
-    ],
-    urlconf='evote.urls',  # Specify the URL configuration module
-    authentication_classes=(JWTAuthentication,),
-
-)
+@cache
+def _docs_view(method, *args):
+   return getattr(_schema_view(), method)(*args, cache_timeout=0)
+
+
+# drf_yasg's schema view pulls in its YAML and codec stack, so it is built on
+# the first docs request instead of when the URLconf loads.
+def docs_view(method, *args):
+   def view(request, *view_args, **view_kwargs):
+      return _docs_view(method, *args)(request, *view_args, **view_kwargs)
+   return view
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/users/', include('accounts.urls')),
     path('api/organizer/', include('organizer.urls')),
-    # Swagger URLs
-    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
+
+if settings.API_DOCS_ENABLED:
+    urlpatterns += [
+        # Swagger URLs
+        re_path(r'^swagger(?P<format>\.json|\.yaml)$', docs_view('without_ui'), name='schema-json'),
+        path('', docs_view('with_ui', 'swagger'), name='schema-swagger-ui'),
+        path('redoc/', docs_view('with_ui', 'redoc'), name='schema-redoc'),
+    ]
@@ -1,11 +1,29 @@
 from django.contrib import admin
-from .models import Event, Contestant, Vote, Payment
+from .models import Event, Contestant, Vote, Payment, EventResult, QueuedVerification, EventArchive, FraudFlag
+from .models import SUPPORTED_PROVIDERS
+from .admin_scaling import ScalableModelAdmin
+
+class ProviderListFilter(admin.SimpleListFilter):
+    # A fixed list; the default filter runs SELECT DISTINCT over every payment.
+    title = 'provider'
+    parameter_name = 'provider'
+
+    def lookups(self, request, model_admin):
+        return [(provider, provider) for provider in SUPPORTED_PROVIDERS]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(provider=self.value())
+        return queryset
+
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
-    list_display = ('reference', 'amount', 'quantity', 'status', 'provider', 'phone_number', 'paid_at')
-    search_fields = ('reference', 'phone_number')
-    list_filter = ('provider', 'status', 'created_at')
+class PaymentAdmin(ScalableModelAdmin):
+    list_display = ('reference', 'contestant', 'amount', 'quantity', 'status', 'provider', 'phone_number', 'paid_at')
+    list_select_related = ('contestant__event',)
+    search_fields = ('=reference', '^phone_number')
+    list_filter = (ProviderListFilter, 'status', 'created_at')
+    raw_id_fields = ('vote', 'contestant')
 
 
 @admin.register(Event)
@@ -25,8 +43,56 @@ class ContestantAdmin(admin.ModelAdmin):
 
 
 @admin.register(Vote)
-class VoteAdmin(admin.ModelAdmin):
+class VoteAdmin(ScalableModelAdmin):
     list_display = ('contestant', 'quantity', 'voter_ip', 'timestamp')
-    search_fields = ('contestant__contestant_name', 'voter_ip')
+    list_select_related = ('contestant__event',)
+    search_fields = ('=voter_ip', '=contestant')
     list_filter = ('timestamp',)
-    date_hierarchy = 'timestamp'
+    raw_id_fields = ('contestant',)
+
+
+@admin.register(EventResult)
+class EventResultAdmin(admin.ModelAdmin):
+    list_display = ('event', 'total_votes', 'total_revenue', 'finalized_at')
+    search_fields = ('event__event_name', 'event__event_id')
+    readonly_fields = ('event', 'total_votes', 'total_revenue', 'payload', 'finalized_at')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(QueuedVerification)
+class QueuedVerificationAdmin(admin.ModelAdmin):
+    list_display = ('reference', 'attempts', 'last_error', 'queued_at', 'last_attempt_at')
+    search_fields = ('=reference',)
+
+
+@admin.register(EventArchive)
+class EventArchiveAdmin(admin.ModelAdmin):
+    list_display = ('event', 'vote_rows', 'payment_rows', 'total_votes', 'total_revenue', 'archived_at')
+    search_fields = ('event__event_name', 'event__event_id')
+    readonly_fields = ('event', 'segment_path', 'checksum', 'vote_rows', 'payment_rows', 'total_votes',
+                       'total_revenue', 'archived_at')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(FraudFlag)
+class FraudFlagAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'value', 'event', 'peak_count', 'times_flagged', 'status', 'last_flagged_at')
+    list_select_related = ('event',)
+    list_filter = ('status', 'kind')
+    list_editable = ('status',)
+    search_fields = ('=value', 'event__event_name')
+    readonly_fields = ('event', 'kind', 'value', 'peak_count', 'window_seconds', 'times_flagged',
+                       'first_flagged_at', 'last_flagged_at')
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,109 @@
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections, router
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+CURSOR_VAR = 'before'
+COUNT_CAP = 10000
+PREFIX_END = '\U0010ffff'
+
+
+def estimated_count(queryset, cap=COUNT_CAP):
+    # Unfiltered Postgres tables report the planner's row estimate; everything
+    # else is counted, but never past `cap` rows.
+    connection = connections[router.db_for_read(queryset.model)]
+    if connection.vendor == 'postgresql' and not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                           [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        if row and row[0] > cap:
+            return int(row[0])
+    return queryset.order_by()[:cap + 1].count()
+
+
+class EstimatedCountPaginator(Paginator):
+
+    @cached_property
+    def count(self):
+        return estimated_count(self.object_list)
+
+
+# Pages by primary key ("?before=<pk>") instead of OFFSET while the list is in
+# its default newest-first order, so page 10,000 costs the same as page 1.
+# Sorting by a column falls back to Django's numbered pages.
+class KeysetChangeList(ChangeList):
+
+    def get_filters_params(self, params=None):
+        params = super().get_filters_params(params)
+        params.pop(CURSOR_VAR, None)
+        return params
+
+    def get_results(self, request):
+        self.params.pop(CURSOR_VAR, None)
+        self.filter_params.pop(CURSOR_VAR, None)
+        self.keyset = ORDER_VAR not in self.params and not self.show_all
+        if not self.keyset:
+            return super().get_results(request)
+
+        cursor = request.GET.get(CURSOR_VAR)
+        queryset = self.queryset
+        if cursor:
+            try:
+                queryset = queryset.filter(pk__lt=int(cursor))
+            except ValueError:
+                raise IncorrectLookupParameters
+        rows = list(queryset[:self.list_per_page + 1])
+        has_next = len(rows) > self.list_per_page
+        self.result_list = rows[:self.list_per_page]
+
+        self.paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        self.result_count = self.paginator.count
+        self.count_capped = self.result_count > COUNT_CAP and connections[router.db_for_read(self.model)].vendor != 'postgresql'
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = has_next or bool(cursor)
+        self.keyset_next = self.get_query_string({CURSOR_VAR: self.result_list[-1].pk}) if has_next else None
+        self.keyset_first = self.get_query_string() if cursor else None
+
+
+# Changelist settings for tables with tens of millions of rows. `=field` and
+# `^field` in search_fields (direct fields only) run as case-sensitive exact
+# and range lookups, which a plain B-tree index can serve; Django's own
+# iexact/istartswith cannot use one.
+class ScalableModelAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ('-pk',)
+    change_list_template = 'admin/keyset_change_list.html'
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+
+        condition = Q()
+        for spec in self.search_fields:
+            name = spec.lstrip('=^')
+            field = self.model._meta.get_field(name)
+            try:
+                value = field.to_python(term)
+                field.run_validators(value)
+            except ValidationError:
+                continue
+            if spec.startswith('^'):
+                condition |= Q(**{f'{name}__gte': value, f'{name}__lt': value + PREFIX_END})
+            else:
+                condition |= Q(**{name: value})
+        if not condition:
+            return queryset.none(), False
+        return queryset.filter(condition), False
@@ -0,0 +1,175 @@
+import gzip
+import hashlib
+import json
+import os
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .bulk import raw_delete_in_batches
+from .caching import VOTES, bump_versions_on_commit
+from .models import Event, EventArchive, Payment, Vote
+from .results import finalize_event
+
+ARCHIVE_RETENTION_DAYS = 90
+ARCHIVE_BATCH_SIZE = 5000
+
+VOTE_FIELDS = ('id', 'contestant_id', 'timestamp', 'voter_ip', 'quantity')
+PAYMENT_FIELDS = ('id', 'vote_id', 'contestant_id', 'amount', 'quantity', 'reference', 'phone_number', 'provider',
+                  'status', 'authorization_url', 'paid_at', 'created_at', 'updated_at')
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def _encode(value):
+    # Full-precision timestamps; DjangoJSONEncoder would round them to milliseconds.
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def archive_root():
+    return Path(getattr(settings, 'ARCHIVE_ROOT', Path(settings.BASE_DIR) / 'archive'))
+
+
+def archivable_events(retention_days=None):
+    if retention_days is None:
+        retention_days = getattr(settings, 'ARCHIVE_RETENTION_DAYS', ARCHIVE_RETENTION_DAYS)
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    return Event.objects.filter(end_date__lte=cutoff, archive__isnull=True)
+
+
+def _event_rows(event):
+    votes = Vote.objects.filter(contestant__event=event)
+    payments = Payment.objects.filter(contestant__event=event)
+    return votes, payments
+
+
+def _write_segment(path, event, votes, payments):
+    digest = hashlib.sha256()
+    counts = {"vote": 0, "payment": 0}
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as fh:
+        def write(record):
+            line = json.dumps(record, default=_encode, separators=(',', ':')) + "\n"
+            digest.update(line.encode())
+            fh.write(line)
+
+        write({"type": "header", "event_id": event.event_id, "archived_at": timezone.now()})
+        for kind, queryset, fields in (("vote", votes, VOTE_FIELDS), ("payment", payments, PAYMENT_FIELDS)):
+            for row in queryset.order_by('pk').values(*fields).iterator(chunk_size=ARCHIVE_BATCH_SIZE):
+                write(dict(row, type=kind))
+                counts[kind] += 1
+    os.replace(tmp_path, path)
+    return digest.hexdigest(), counts
+
+
+# Moves an event's votes and payments into a gzipped NDJSON segment and
+# leaves an EventArchive summary (plus the final results snapshot) behind.
+def archive_event(event, batch_size=ARCHIVE_BATCH_SIZE):
+    if EventArchive.objects.filter(event=event).exists():
+        raise ArchiveError(f"Event {event.event_id} is already archived.")
+    if event.end_date > timezone.now():
+        raise ArchiveError(f"Event {event.event_id} has not ended yet.")
+
+    # Results must survive the votes leaving the hot tables.
+    finalize_event(event)
+
+    votes, payments = _event_rows(event)
+    totals = votes.aggregate(total_votes=Sum('quantity'))
+    revenue = payments.filter(status='success').aggregate(total=Sum('amount'))['total'] or Decimal('0')
+
+    directory = archive_root() / str(event.event_id)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{timezone.now():%Y%m%dT%H%M%S}.ndjson.gz"
+    checksum, counts = _write_segment(path, event, votes, payments)
+
+    try:
+        with transaction.atomic():
+            archive = EventArchive.objects.create(
+                event=event,
+                segment_path=str(path),
+                checksum=checksum,
+                vote_rows=counts["vote"],
+                payment_rows=counts["payment"],
+                total_votes=totals['total_votes'] or 0,
+                total_revenue=revenue,
+            )
+            # Payments reference votes, so they go first.
+            raw_delete_in_batches(payments, batch_size)
+            raw_delete_in_batches(votes, batch_size)
+            bump_versions_on_commit([event.pk], VOTES)
+    except Exception:
+        path.unlink(missing_ok=True)
+        raise
+    return archive
+
+
+def _read_segment(archive):
+    path = Path(archive.segment_path)
+    if not path.exists():
+        raise ArchiveError(f"Segment {path} is missing.")
+    digest = hashlib.sha256()
+    with gzip.open(path, 'rt', encoding='utf-8') as fh:
+        for line in fh:
+            digest.update(line.encode())
+            yield json.loads(line)
+    if digest.hexdigest() != archive.checksum:
+        raise ArchiveError(f"Segment {path} failed its checksum.")
+
+
+def _flush(model, rows, date_fields, batch_size):
+    # bulk_create stamps auto_now/auto_now_add fields over the archived values,
+    # so the original dates are put back with bulk_update afterwards.
+    originals = [[getattr(row, field) for field in date_fields] for row in rows]
+    objects = model.objects.bulk_create(rows, batch_size=batch_size)
+    for obj, values in zip(objects, originals):
+        for field, value in zip(date_fields, values):
+            setattr(obj, field, value)
+    model.objects.bulk_update(objects, date_fields, batch_size=batch_size)
+    rows.clear()
+
+
+def restore_event(event, batch_size=ARCHIVE_BATCH_SIZE):
+    archive = EventArchive.objects.filter(event=event).first()
+    if archive is None:
+        raise ArchiveError(f"Event {event.event_id} is not archived.")
+
+    votes, payments = [], []
+    with transaction.atomic():
+        for record in _read_segment(archive):
+            kind = record.pop("type")
+            if kind == "vote":
+                record["timestamp"] = parse_datetime(record["timestamp"])
+                votes.append(Vote(**record))
+                if len(votes) >= batch_size:
+                    _flush(Vote, votes, ['timestamp'], batch_size)
+            elif kind == "payment":
+                if votes:
+                    _flush(Vote, votes, ['timestamp'], batch_size)
+                record["amount"] = Decimal(record["amount"])
+                for field in ('paid_at', 'created_at', 'updated_at'):
+                    record[field] = parse_datetime(record[field]) if record[field] else None
+                payments.append(Payment(**record))
+                if len(payments) >= batch_size:
+                    _flush(Payment, payments, ['created_at', 'updated_at'], batch_size)
+        if votes:
+            _flush(Vote, votes, ['timestamp'], batch_size)
+        if payments:
+            _flush(Payment, payments, ['created_at', 'updated_at'], batch_size)
+        archive.delete()
+        bump_versions_on_commit([event.pk], VOTES)
+
+    Path(archive.segment_path).unlink(missing_ok=True)
+    return archive
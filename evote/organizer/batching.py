@@ -0,0 +1,80 @@
+import io
+import json
+from urllib.parse import urlsplit
+
+from django.db import transaction
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+from .caching import bypass_caches
+
+ORGANIZER_ROUTE_PREFIX = 'api/organizer/'
+# Payment routes call Paystack, which a rolled-back batch cannot undo.
+BATCH_EXCLUDED_ROUTES = frozenset({'organizer-batch', 'paystack-init', 'paystack-verify', 'paystack-verify-batch'})
+
+
+class _RolledBack(Exception):
+    def __init__(self, index):
+        super().__init__(index)
+        self.index = index
+
+
+def _sub_request(request, method, path, body):
+    parts = urlsplit(path)
+    payload = b'' if body is None else json.dumps(body).encode()
+
+    sub = HttpRequest()
+    sub.method = method
+    sub.path = sub.path_info = parts.path
+    sub.META = dict(
+        request.META,
+        REQUEST_METHOD=method,
+        PATH_INFO=parts.path,
+        QUERY_STRING=parts.query,
+        CONTENT_TYPE='application/json',
+        CONTENT_LENGTH=str(len(payload)),
+        HTTP_ACCEPT='application/json',
+    )
+    sub.GET = QueryDict(parts.query)
+    sub._stream = io.BytesIO(payload)
+    sub._read_started = False
+    # The batch request is authenticated once; DRF's Request uses this user
+    # instead of running the authentication classes (and their queries) again.
+    sub.user = request.user
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def _dispatch(request, item):
+    path = item['path']
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return {"status": 404, "body": {"detail": "Not found."}}
+    if not match.route.startswith(ORGANIZER_ROUTE_PREFIX) or match.url_name in BATCH_EXCLUDED_ROUTES:
+        return {"status": 400, "body": {"detail": "This route cannot be batched."}}
+
+    response = match.func(_sub_request(request, item['method'], path, item.get('body')), *match.args, **match.kwargs)
+    return {"status": response.status_code, "body": getattr(response, 'data', None)}
+
+
+# Runs organizer sub-requests in order through their normal views. With
+# `atomic`, they share one transaction and the first 4xx/5xx rolls all of them
+# back; returns the results so far and the index that failed. Atomic batches
+# skip the caches, which a rollback could not undo.
+def run_batch(request, items, atomic=False):
+    if not atomic:
+        return [_dispatch(request, item) for item in items], None
+
+    results = []
+    try:
+        with bypass_caches(), transaction.atomic():
+            for index, item in enumerate(items):
+                result = _dispatch(request, item)
+                results.append(result)
+                if result["status"] >= 400:
+                    raise _RolledBack(index)
+    except _RolledBack as exc:
+        return results, exc.index
+    return results, None
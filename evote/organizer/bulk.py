@@ -0,0 +1,15 @@
+from django.db import router
+
+
+def raw_delete_in_batches(queryset, batch_size=5000):
+    # Deletes by primary-key batches with plain DELETE statements. Django's
+    # collector is skipped, so no rows are loaded into memory and no delete
+    # signals fire; callers are responsible for dependent rows.
+    model = queryset.model
+    using = router.db_for_write(model)
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += model.objects.filter(pk__in=ids)._raw_delete(using)
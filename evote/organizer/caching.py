@@ -0,0 +1,159 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .metrics import observe_cache
+from .models import Event
+
+LOCK_SECONDS = 10
+WAIT_SECONDS = 2.0
+POLL_SECONDS = 0.05
+
+# Set while an atomic organizer batch runs: its sub-requests can read their own
+# uncommitted writes, and nothing they cache would be undone by a rollback.
+_bypassed = ContextVar('evote_cache_bypassed', default=False)
+
+
+@contextmanager
+def bypass_caches():
+    token = _bypassed.set(True)
+    try:
+        yield
+    finally:
+        _bypassed.reset(token)
+
+
+def caches_bypassed():
+    return _bypassed.get()
+
+
+# Caches compute() for `timeout` seconds with stampede protection: the entry
+# is kept a while past its soft expiry, and once it goes stale a single caller
+# (whoever wins cache.add on the lock key) recomputes it while everyone else
+# keeps serving the stale value. On a cold key, losers wait briefly for the
+# winner instead of all hitting the database at once.
+def get_or_compute(key, timeout, compute, grace=None):
+    if caches_bypassed():
+        return compute()
+    grace = timeout * 5 if grace is None else grace
+    lock_key = f"{key}:lock"
+
+    entry = cache.get(key)
+    now = time.monotonic()
+    if entry is not None and entry[0] > time.time():
+        return entry[1]
+
+    if cache.add(lock_key, 1, LOCK_SECONDS):
+        try:
+            value = compute()
+            cache.set(key, (time.time() + timeout, value), timeout + grace)
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    if entry is not None:
+        return entry[1]
+
+    while time.monotonic() - now < WAIT_SECONDS:
+        time.sleep(POLL_SECONDS)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[1]
+    return compute()
+
+
+# Per-event cache versions. Cached event data is keyed by the event's current
+# version numbers, so invalidating means bumping a counter: stale entries are
+# never looked up again and simply expire. There are two scopes so that the
+# vote stream of a live event does not evict data that only depends on the
+# event and contestant details (contestant cards).
+META = 'meta'
+VOTES = 'votes'
+EVENT_VERSION_KEY = "evote:event:{event_pk}:version:{scope}"
+EVENT_PK_KEY = "evote:event-pk:{event_id}"
+EVENT_EXISTS_KEY = "evote:event-exists:{event_pk}"
+EVENT_CACHE_TIMEOUT = 300
+# Version keys never expire; losing one only costs a cold cache for that event.
+EVENT_VERSION_TIMEOUT = None
+
+
+def event_cache_enabled():
+    return getattr(settings, 'EVENT_CACHE_ENABLED', True) and not caches_bypassed()
+
+
+def event_versions(event_pks, scopes=(META, VOTES)):
+    keys = {
+        (pk, scope): EVENT_VERSION_KEY.format(event_pk=pk, scope=scope)
+        for pk in event_pks for scope in scopes
+    }
+    found = cache.get_many(keys.values())
+    versions = {}
+    for ident, key in keys.items():
+        if key not in found:
+            # Seeding with the clock instead of 1 keeps versions moving forward
+            # when a version key expires or is evicted.
+            cache.add(key, time.time_ns(), EVENT_VERSION_TIMEOUT)
+            found[key] = cache.get(key)
+        versions[ident] = found[key]
+    return versions
+
+
+def bump_event_versions(event_pks, scope):
+    for pk in set(event_pks):
+        key = EVENT_VERSION_KEY.format(event_pk=pk, scope=scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), EVENT_VERSION_TIMEOUT)
+
+
+# Bumps wait for the surrounding transaction to commit so a concurrent reader
+# cannot cache pre-commit rows under the new version.
+def bump_versions_on_commit(event_pks, scope):
+    event_pks = list(event_pks)
+    transaction.on_commit(lambda: bump_event_versions(event_pks, scope))
+
+
+def get_event_cached(event_pk, name, compute, scopes=(META, VOTES)):
+    if not event_cache_enabled():
+        observe_cache('event', 'bypass')
+        return compute()
+
+    versions = event_versions([event_pk], scopes)
+    key = f"evote:event:{event_pk}:{name}:" + ":".join(str(versions[(event_pk, scope)]) for scope in scopes)
+    value = cache.get(key)
+    if value is not None:
+        observe_cache('event', 'hit')
+        return value
+
+    observe_cache('event', 'miss')
+    value = compute()
+    cache.set(key, value, getattr(settings, 'EVENT_CACHE_TIMEOUT', EVENT_CACHE_TIMEOUT))
+    return value
+
+
+def event_pk_for(event_id):
+    # event_id never changes, so the mapping can be kept indefinitely.
+    key = EVENT_PK_KEY.format(event_id=event_id)
+    pk = cache.get(key) if event_cache_enabled() else None
+    if pk is None:
+        pk = Event.objects.filter(event_id=event_id).values_list('pk', flat=True).first()
+        if pk is not None and event_cache_enabled():
+            cache.set(key, pk, None)
+    return pk
+
+
+def event_exists(event_pk):
+    # Only events that exist are remembered, so probing arbitrary ids cannot
+    # fill the cache with version keys and empty entries.
+    key = EVENT_EXISTS_KEY.format(event_pk=event_pk)
+    if event_cache_enabled() and cache.get(key):
+        return True
+    exists = Event.all_objects.filter(pk=event_pk).exists()
+    if exists and event_cache_enabled():
+        cache.set(key, True, None)
+    return exists
@@ -0,0 +1,62 @@
+from django.core.cache import cache
+
+from .caching import META, event_cache_enabled, event_versions
+from .metrics import observe_cache
+from .models import Contestant
+
+CARD_CACHE_KEY = "evote:card:{pk}"
+CARD_CACHE_TIMEOUT = 60
+
+
+def contestant_card(contestant):
+    return {
+        "id": contestant.id,
+        "name": contestant.contestant_name,
+        "bio": contestant.bio,
+        "photo_url": contestant.photo_url,
+        "event": contestant.event.event_name,
+    }
+
+
+# Cards are stored with the event and its meta version at the time they were
+# built; a card whose event has moved on since is treated as a miss.
+def get_contestant_cards(ids):
+    if not event_cache_enabled():
+        observe_cache('card', 'bypass')
+        return _load_cards(ids)
+
+    keys = {pk: CARD_CACHE_KEY.format(pk=pk) for pk in ids}
+    cached = cache.get_many(keys.values())
+    entries = {pk: cached[key] for pk, key in keys.items() if key in cached}
+    versions = event_versions({entry["event"] for entry in entries.values()}, (META,))
+    cards = {
+        pk: entry["card"] for pk, entry in entries.items()
+        if versions[(entry["event"], META)] == entry["version"]
+    }
+
+    missing = [pk for pk in ids if pk not in cards]
+    observe_cache('card', 'hit', len(cards))
+    if missing:
+        # Read the versions before the rows, as get_event_cached does: an edit
+        # landing in between then leaves the card stamped with the old version.
+        event_pks = set(Contestant.objects.filter(pk__in=missing).values_list('event_id', flat=True))
+        versions = event_versions(event_pks, (META,))
+        fresh = _load_cards(missing, with_event=True)
+        cache.set_many({
+            keys[pk]: {"event": event_pk, "version": versions[(event_pk, META)], "card": card}
+            for pk, (event_pk, card) in fresh.items() if (event_pk, META) in versions
+        }, CARD_CACHE_TIMEOUT)
+        observe_cache('card', 'miss', len(missing))
+        cards.update({pk: card for pk, (_, card) in fresh.items()})
+    return cards
+
+
+def _load_cards(ids, with_event=False):
+    contestants = (
+        Contestant.objects.filter(pk__in=ids, event__deleted_at__isnull=True)
+        .select_related('event')
+        .only('id', 'contestant_name', 'bio', 'photo_url', 'event__event_name')
+    )
+    if with_event:
+        return {contestant.pk: (contestant.event_id, contestant_card(contestant)) for contestant in contestants}
+    return {contestant.pk: contestant_card(contestant) for contestant in contestants}
@@ -0,0 +1,110 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .caching import get_or_compute
+from .models import Contestant, EventResult, Payment
+
+DASHBOARD_CACHE_SECONDS = 5
+DASHBOARD_CACHE_KEY = "evote:dashboard:{event_pk}"
+CENTS = Decimal('0.01')
+
+
+def _money(value):
+    return str(Decimal(value or 0).quantize(CENTS))
+
+
+def compute_dashboard(event):
+    now = timezone.now()
+    hour_ago = now - timedelta(hours=1)
+
+    contestants = list(
+        Contestant.objects.filter(event=event)
+        .annotate(
+            total_votes=Sum('votes__quantity'),
+            last_hour_votes=Sum('votes__quantity', filter=Q(votes__timestamp__gte=hour_ago)),
+        )
+        .order_by('-total_votes', 'contestant_name')
+        .values('id', 'contestant_name', 'total_votes', 'last_hour_votes')
+    )
+
+    providers = (
+        Payment.objects.filter(contestant__event=event)
+        .values('provider')
+        .annotate(
+            success=Count('pk', filter=Q(status='success')),
+            failed=Count('pk', filter=Q(status='failed')),
+            pending=Count('pk', filter=Q(status='pending')),
+            revenue=Sum('amount', filter=Q(status='success')),
+        )
+        .order_by('provider')
+    )
+
+    payments_by_provider = {}
+    total_revenue = Decimal('0')
+    for row in providers:
+        payments_by_provider[row['provider'] or 'unknown'] = {
+            "success": row['success'],
+            "failed": row['failed'],
+            "pending": row['pending'],
+            "revenue": _money(row['revenue']),
+        }
+        total_revenue += row['revenue'] or 0
+
+    return {
+        "event_id": event.event_id,
+        "event_name": event.event_name,
+        "total_votes": sum(row['total_votes'] or 0 for row in contestants),
+        "total_revenue": _money(total_revenue),
+        "last_hour_votes": sum(row['last_hour_votes'] or 0 for row in contestants),
+        "payments_by_provider": payments_by_provider,
+        "contestants": [
+            {
+                "contestant_id": row['id'],
+                "contestant_name": row['contestant_name'],
+                "total_votes": row['total_votes'] or 0,
+                "last_hour_votes": row['last_hour_votes'] or 0,
+            }
+            for row in contestants
+        ],
+        "archived": False,
+        "computed_at": now.isoformat(),
+    }
+
+
+def _archived_dashboard(event):
+    # Archived events have no votes or payments left in the hot tables.
+    result = EventResult.objects.get(event=event).payload
+    return {
+        "event_id": event.event_id,
+        "event_name": event.event_name,
+        "total_votes": result["total_votes"],
+        "total_revenue": result["total_revenue"],
+        "last_hour_votes": 0,
+        "payments_by_provider": {},
+        "contestants": [
+            {
+                "contestant_id": row["contestant_id"],
+                "contestant_name": row["contestant_name"],
+                "total_votes": row["votes"],
+                "last_hour_votes": 0,
+            }
+            for row in result["standings"]
+        ],
+        "archived": True,
+        "computed_at": result["finalized_at"],
+    }
+
+
+def get_dashboard(event):
+    timeout = getattr(settings, 'DASHBOARD_CACHE_SECONDS', DASHBOARD_CACHE_SECONDS)
+
+    def compute():
+        if hasattr(event, 'archive'):
+            return _archived_dashboard(event)
+        return compute_dashboard(event)
+
+    return get_or_compute(DASHBOARD_CACHE_KEY.format(event_pk=event.pk), timeout, compute)
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from .bulk import raw_delete_in_batches
+from .caching import VOTES, bump_versions_on_commit
+from .models import Event, EventArchive, Payment, Vote
+from .results import RESULTS_CACHE_KEY
+
+PURGE_BATCH_SIZE = 5000
+
+
+# Deleting an event only marks it; the default manager hides it from then on
+# and purge_deleted_events removes the rows later.
+def soft_delete_event(event):
+    event.deleted_at = timezone.now()
+    event.save(update_fields=['deleted_at', 'date_updated'])
+    cache.delete(RESULTS_CACHE_KEY.format(event_id=event.event_id))
+
+
+def deleted_events():
+    return Event.all_objects.filter(deleted_at__isnull=False).order_by('deleted_at')
+
+
+def purge_event(event, batch_size=PURGE_BATCH_SIZE):
+    # Votes and payments go in raw batches that each commit on their own, so a
+    # huge event never holds long locks or loads rows into memory. Payments
+    # reference votes, so they go first. What is left (contestants, results,
+    # archive rows) is small enough for the normal cascade.
+    payments = raw_delete_in_batches(
+        Payment.objects.filter(Q(contestant__event=event) | Q(vote__contestant__event=event)), batch_size
+    )
+    votes = raw_delete_in_batches(Vote.objects.filter(contestant__event=event), batch_size)
+    bump_versions_on_commit([event.pk], VOTES)
+
+    archive = EventArchive.objects.filter(event=event).first()
+    Event.all_objects.filter(pk=event.pk).delete()
+    if archive is not None:
+        Path(archive.segment_path).unlink(missing_ok=True)
+    return {"payments": payments, "votes": votes}
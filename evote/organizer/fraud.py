@@ -0,0 +1,190 @@
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from operator import sub
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .metrics import observe_fraud_flag
+from .models import FraudFlag
+
+FRAUD_DETECTION_ENABLED = True
+FRAUD_WINDOW_SECONDS = 300
+FRAUD_WINDOW_BUCKETS = 5
+FRAUD_VOTES_PER_WINDOW = 60
+FRAUD_SKETCH_WIDTH = 512
+FRAUD_SKETCH_DEPTH = 4
+FRAUD_TOP_K = 32
+FRAUD_MAX_EVENTS = 200
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class SlidingCountMinSketch:
+    # A count-min sketch per time bucket plus their running sum. Adding a key
+    # touches `depth` counters of the current bucket and of the sum; when a
+    # bucket falls out of the window it is subtracted from the sum and reused,
+    # so memory is fixed and estimates always cover the last `buckets` buckets.
+
+    def __init__(self, width, depth, buckets, bucket_seconds):
+        self.width = width
+        self.depth = depth
+        self.bucket_seconds = bucket_seconds
+        self.buckets = [array('I', bytes(4 * width * depth)) for _ in range(buckets)]
+        self.total = array('I', bytes(4 * width * depth))
+        self.position = 0
+        self.epoch = None
+
+    def _cells(self, key):
+        return [row * self.width + hash((row, key)) % self.width for row in range(self.depth)]
+
+    # Moves the window forward to `now`; returns True if any bucket expired.
+    def advance(self, now):
+        epoch = int(now // self.bucket_seconds)
+        if self.epoch is None:
+            self.epoch = epoch
+        steps = epoch - self.epoch
+        if steps <= 0:
+            return False
+        self.epoch = epoch
+        if steps >= len(self.buckets):
+            for bucket in self.buckets:
+                bucket[:] = array('I', bytes(len(bucket) * 4))
+            self.total[:] = array('I', bytes(len(self.total) * 4))
+            return True
+        for _ in range(steps):
+            self.position = (self.position + 1) % len(self.buckets)
+            expired = self.buckets[self.position]
+            self.total = array('I', map(sub, self.total, expired))
+            expired[:] = array('I', bytes(len(expired) * 4))
+        return True
+
+    def add(self, key):
+        current = self.buckets[self.position]
+        estimate = None
+        for cell in self._cells(key):
+            current[cell] += 1
+            self.total[cell] += 1
+            if estimate is None or self.total[cell] < estimate:
+                estimate = self.total[cell]
+        return estimate
+
+    def estimate(self, key):
+        return min(self.total[cell] for cell in self._cells(key))
+
+
+class EventWindow:
+    # Per-event detector: the sketch estimates every key's count in the window,
+    # and a fixed-size heavy-hitters table (top-K by estimate) remembers which
+    # of the busiest keys have already been flagged in this burst.
+
+    def __init__(self, threshold, window_seconds, buckets, width, depth, top_k):
+        self.threshold = threshold
+        self.top_k = top_k
+        self.sketch = SlidingCountMinSketch(width, depth, buckets, window_seconds / buckets)
+        self.heavy = {}
+
+    def _refresh(self):
+        for key, entry in list(self.heavy.items()):
+            entry[0] = self.sketch.estimate(key)
+            if entry[0] == 0:
+                del self.heavy[key]
+            elif entry[0] < self.threshold:
+                # The burst has left the window; a new one is flagged again.
+                entry[1] = False
+
+    # Counts one vote for `key`; returns its estimate if it just crossed the threshold.
+    def observe(self, key, now):
+        if self.sketch.advance(now):
+            self._refresh()
+        estimate = self.sketch.add(key)
+
+        entry = self.heavy.get(key)
+        if entry is None:
+            if len(self.heavy) >= self.top_k:
+                lightest = min(self.heavy, key=lambda k: self.heavy[k][0])
+                if self.heavy[lightest][0] >= estimate:
+                    return None
+                del self.heavy[lightest]
+            entry = self.heavy[key] = [estimate, False]
+        entry[0] = estimate
+        if estimate >= self.threshold and not entry[1]:
+            entry[1] = True
+            return estimate
+        return None
+
+
+# One window per event in this process, least recently voted-on evicted first.
+_lock = threading.Lock()
+_windows = OrderedDict()
+
+
+def _window(event_pk):
+    window = _windows.get(event_pk)
+    if window is None:
+        if len(_windows) >= _setting('FRAUD_MAX_EVENTS', FRAUD_MAX_EVENTS):
+            _windows.popitem(last=False)
+        window = _windows[event_pk] = EventWindow(
+            threshold=_setting('FRAUD_VOTES_PER_WINDOW', FRAUD_VOTES_PER_WINDOW),
+            window_seconds=_setting('FRAUD_WINDOW_SECONDS', FRAUD_WINDOW_SECONDS),
+            buckets=_setting('FRAUD_WINDOW_BUCKETS', FRAUD_WINDOW_BUCKETS),
+            width=_setting('FRAUD_SKETCH_WIDTH', FRAUD_SKETCH_WIDTH),
+            depth=_setting('FRAUD_SKETCH_DEPTH', FRAUD_SKETCH_DEPTH),
+            top_k=_setting('FRAUD_TOP_K', FRAUD_TOP_K),
+        )
+    else:
+        _windows.move_to_end(event_pk)
+    return window
+
+
+# `voters` is one (voter_ip, phone_number) pair per recorded vote. Counting is
+# in memory; only a key crossing the threshold writes a FraudFlag row.
+def record_votes(event_pk, voters):
+    if not _setting('FRAUD_DETECTION_ENABLED', FRAUD_DETECTION_ENABLED):
+        return
+    now = time.time()
+    crossed = []
+    with _lock:
+        window = _window(event_pk)
+        for voter_ip, phone_number in voters:
+            for kind, value in (('ip', voter_ip), ('phone', phone_number)):
+                if not value:
+                    continue
+                estimate = window.observe((kind, value), now)
+                if estimate is not None:
+                    crossed.append((kind, value, estimate))
+    for kind, value, estimate in crossed:
+        flag_voter(event_pk, kind, value, estimate)
+
+
+def record_votes_on_commit(event_pk, voters):
+    voters = list(voters)
+    transaction.on_commit(lambda: record_votes(event_pk, voters), robust=True)
+
+
+def flag_voter(event_pk, kind, value, count):
+    now = timezone.now()
+    flag, created = FraudFlag.objects.get_or_create(
+        event_id=event_pk, kind=kind, value=value[:64],
+        defaults={
+            "peak_count": count,
+            "window_seconds": _setting('FRAUD_WINDOW_SECONDS', FRAUD_WINDOW_SECONDS),
+            "last_flagged_at": now,
+        },
+    )
+    if not created:
+        FraudFlag.objects.filter(pk=flag.pk).update(
+            peak_count=Greatest('peak_count', count),
+            times_flagged=F('times_flagged') + 1,
+            last_flagged_at=now,
+            status='open',
+        )
+    observe_fraud_flag(kind)
+
@@ -0,0 +1,38 @@
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from organizer.archive import ArchiveError, archivable_events, archive_event
+from organizer.models import Event
+
+
+class Command(BaseCommand):
+    help = "Move votes and payments of long-closed events out of the hot tables into NDJSON segments."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int,
+                            help="Archive events closed longer than this (default: ARCHIVE_RETENTION_DAYS).")
+        parser.add_argument('--event', type=uuid.UUID, help="Archive only this event_id, regardless of retention.")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['event']:
+            events = Event.objects.filter(event_id=options['event'])
+            if not events.exists():
+                raise CommandError(f"Event '{options['event']}' does not exist.")
+        else:
+            events = archivable_events(options['retention_days'])
+
+        for event in events.iterator():
+            if options['dry_run']:
+                self.stdout.write(f"Would archive {event.event_id} ({event.event_name})")
+                continue
+            try:
+                archive = archive_event(event)
+            except ArchiveError as exc:
+                self.stderr.write(str(exc))
+                continue
+            self.stdout.write(
+                f"Archived {event.event_id}: {archive.vote_rows} votes, {archive.payment_rows} payments "
+                f"-> {archive.segment_path}"
+            )
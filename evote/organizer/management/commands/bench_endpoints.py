@@ -0,0 +1,260 @@
+import json
+import logging
+import math
+import platform
+import subprocess
+import time
+import uuid
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts import urls as accounts_urls
+from accounts.models import CustomUser
+from organizer import urls as organizer_urls
+from organizer.middleware import _QueryTracker
+from organizer.models import Event, Contestant, Vote, Payment
+from organizer.paystack_sim import PaystackSimulator
+from organizer.receipts import sign_receipt
+
+
+# Each builder returns (method, path, payload, authenticated) for one request.
+# Routes without a builder are reported as skipped so new URLs get noticed.
+def _build_requests(ctx):
+    event, contestant, organizer = ctx['event'], ctx['contestant'], ctx['organizer']
+    return {
+        'event-create': lambda i: ('post', reverse('event-create'), {
+            "event_name": f"Bench event {i}",
+            "start_date": timezone.now().isoformat(),
+            "end_date": (timezone.now() + timezone.timedelta(days=1)).isoformat(),
+            "vote_type": "paid",
+            "price_per_vote": "1.00",
+        }, True),
+        'event-list': lambda i: ('get', reverse('event-list'), None, True),
+        'event-trending': lambda i: ('get', reverse('event-trending'), None, False),
+        'event-detail': lambda i: ('get', reverse('event-detail', args=[event.event_id]), None, False),
+        'event-results': lambda i: ('get', reverse('event-results', args=[ctx['closed_event'].event_id]), None, False),
+        'event-dashboard': lambda i: ('get', reverse('event-dashboard', args=[event.event_id]), None, True),
+        'event-vote-audit': lambda i: ('get', reverse('event-vote-audit', args=[event.event_id]), None, True),
+        'event-manage': lambda i: ('put', reverse('event-manage', args=[event.event_id]), {
+            "event_name": event.event_name,
+            "start_date": event.start_date.isoformat(),
+            "end_date": event.end_date.isoformat(),
+            "vote_type": event.vote_type,
+            "price_per_vote": str(event.price_per_vote),
+        }, True),
+        'contestant-create': lambda i: ('post', reverse('contestant-create'), {
+            "event": event.event_id,
+            "contestant_name": f"Bench contestant {i}",
+        }, True),
+        'contestant-list': lambda i: ('get', reverse('contestant-list', args=[event.pk]), None, False),
+        'organizer-batch': lambda i: ('post', reverse('organizer-batch'), {"requests": [
+            {"method": "GET", "path": reverse('event-dashboard', args=[event.event_id])},
+            {"method": "PATCH", "path": reverse('contestant-manage', args=[contestant.pk]),
+             "body": {"contestant_name": contestant.contestant_name}},
+        ], "atomic": True}, True),
+        'contestant-manage': lambda i: ('put', reverse('contestant-manage', args=[contestant.pk]), {
+            "event": event.event_id,
+            "contestant_name": contestant.contestant_name,
+        }, True),
+        'contestant-batch': lambda i: ('get', reverse('contestant-batch'), {
+            "ids": ",".join(str(pk) for pk in event.contestants.values_list('pk', flat=True)[:30]),
+        }, False),
+        'vote-contestant': lambda i: ('get', reverse('vote-contestant', args=[contestant.pk]), None, False),
+        'search': lambda i: ('get', reverse('search'), {"q": contestant.contestant_name[:6]}, False),
+        'paystack-init': lambda i: ('post', reverse('paystack-init'), {
+            "phone_number": f"055{i:07d}",
+            "contestant_id": contestant.pk,
+            "quantity": 3,
+            "provider": "mtn",
+        }, False),
+        'paystack-verify': lambda i: ('post', reverse('paystack-verify'), {
+            "reference": ctx['new_reference'](),
+        }, False),
+        'paystack-verify-batch': lambda i: ('post', reverse('paystack-verify-batch'), {
+            "references": [ctx['new_reference']() for _ in range(20)],
+        }, False),
+        'receipt-check': lambda i: ('get', reverse('receipt-check') + '?receipt=' + ctx['receipt'], None, False),
+        'register': lambda i: ('post', reverse('register'), {
+            "email": f"bench-{i}-{uuid.uuid4().hex[:8]}@example.com",
+            "username": f"bench-{i}-{uuid.uuid4().hex[:8]}",
+            "password": "bench-password",
+        }, False),
+        'login': lambda i: ('post', reverse('login'), {
+            "email": organizer.email,
+            "password": ctx['password'],
+        }, False),
+        'profile': lambda i: ('get', reverse('profile'), None, True),
+    }
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Benchmark every organizer and accounts endpoint against the current database (see seed_load)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--prefix', default='load', help="Prefix used when running seed_load.")
+        parser.add_argument('--only', nargs='*', help="Benchmark only these URL names.")
+        parser.add_argument('--output', help="Write machine-readable results to this JSON file.")
+        parser.add_argument('--compare', help="A previous --output file to diff against.")
+        parser.add_argument('--paystack-latency', default='fixed:0',
+                            help="Latency injected by the Paystack simulator, e.g. lognormal:150:0.4.")
+        parser.add_argument('--paystack-error-rate', type=float, default=0.0)
+
+    def handle(self, *args, **options):
+        organizer = (CustomUser.objects.filter(username__startswith=f"{options['prefix']}-", events__isnull=False)
+                     .order_by('pk').first())
+        if organizer is None:
+            raise CommandError(f"No seeded data with prefix '{options['prefix']}'; run seed_load first.")
+        # Payment endpoints only accept votes for events that are open.
+        event = (organizer.events.filter(start_date__lte=timezone.now(), end_date__gt=timezone.now()).order_by('pk').first()
+                 or organizer.events.order_by('pk').first())
+        contestant = event.contestants.order_by('pk').first()
+
+        simulator = PaystackSimulator(latency=options['paystack_latency'],
+                                      error_rate=options['paystack_error_rate']).start()
+        ctx = {
+            'organizer': organizer,
+            'event': event,
+            'contestant': contestant,
+            'closed_event': Event.objects.filter(end_date__lte=timezone.now()).order_by('pk').first() or event,
+            'password': f"{options['prefix']}-password",
+            'receipt': sign_receipt("bench-receipt", contestant.pk, 3, timezone.now()),
+        }
+
+        def new_reference():
+            reference = f"bench-{uuid.uuid4().hex}"
+            simulator.add_transaction(reference, 300, {
+                "contestant_id": contestant.pk,
+                "quantity": 3,
+                "phone_number": "0551234987",
+                "provider": "mtn",
+            })
+            return reference
+
+        ctx['new_reference'] = new_reference
+        builders = _build_requests(ctx)
+
+        token = str(RefreshToken.for_user(organizer).access_token)
+        client = Client(raise_request_exception=False)
+        auth = {'HTTP_AUTHORIZATION': f"Bearer {token}"}
+
+        names = [p.name for p in organizer_urls.urlpatterns + accounts_urls.urlpatterns if p.name]
+        if options['only']:
+            names = [n for n in names if n in options['only']]
+
+        # Error responses are counted in the results; their tracebacks would only drown the report.
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+        results = []
+        try:
+            with override_settings(PAYSTACK_BASE_URL=simulator.base_url, ALLOWED_HOSTS=['testserver']):
+                for name in names:
+                    builder = builders.get(name)
+                    if builder is None:
+                        results.append({"name": name, "skipped": True})
+                        continue
+                    results.append(self._run(client, auth, name, builder, options['iterations'], options['warmup']))
+        finally:
+            simulator.stop()
+
+        report = {
+            "meta": {
+                "commit": _git_commit(),
+                "timestamp": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "iterations": options['iterations'],
+                "dataset": {
+                    "organizers": CustomUser.objects.count(),
+                    "events": Event.objects.count(),
+                    "contestants": Contestant.objects.count(),
+                    "votes": Vote.objects.count(),
+                    "payments": Payment.objects.count(),
+                },
+            },
+            "results": results,
+        }
+
+        self._print(results, self._load(options['compare']) if options['compare'] else None)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def _run(self, client, auth, name, builder, iterations, warmup):
+        latencies, queries, statuses = [], [], {}
+        method, path = None, None
+        started = time.perf_counter()
+        for i in range(warmup + iterations):
+            method, path, payload, authenticated = builder(i)
+            extra = auth if authenticated else {}
+            tracker = _QueryTracker()
+            # Every request is rolled back so the seeded data stays identical between runs.
+            with transaction.atomic():
+                with connection.execute_wrapper(tracker):
+                    start = time.perf_counter()
+                    response = getattr(client, method)(path, data=payload, content_type='application/json', **extra)
+                    elapsed = time.perf_counter() - start
+                transaction.set_rollback(True)
+            if i < warmup:
+                started = time.perf_counter()
+                continue
+            latencies.append(elapsed)
+            queries.append(tracker.count)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        total = time.perf_counter() - started
+
+        return {
+            "name": name,
+            "method": method.upper(),
+            "path": path,
+            "iterations": iterations,
+            "statuses": {str(k): v for k, v in sorted(statuses.items())},
+            "throughput_rps": round(iterations / total, 2),
+            "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+            "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+            "queries_per_request": round(sum(queries) / len(queries), 2),
+        }
+
+    def _load(self, path):
+        with open(path) as fh:
+            return {r['name']: r for r in json.load(fh)['results'] if not r.get('skipped')}
+
+    def _print(self, results, baseline):
+        self.stdout.write(f"{'endpoint':<20} {'status':<12} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'queries':>8}")
+        for r in results:
+            if r.get('skipped'):
+                self.stdout.write(f"{r['name']:<20} skipped (no request builder)")
+                continue
+            statuses = ','.join(r['statuses'])
+            line = (f"{r['name']:<20} {statuses:<12} {r['throughput_rps']:>9} {r['p50_ms']:>9} "
+                    f"{r['p99_ms']:>9} {r['queries_per_request']:>8}")
+            previous = baseline.get(r['name']) if baseline else None
+            if previous:
+                delta = (r['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100 if previous['p50_ms'] else 0
+                line += f"  p50 {delta:+.1f}%  queries {r['queries_per_request'] - previous['queries_per_request']:+g}"
+            self.stdout.write(line)
@@ -0,0 +1,68 @@
+import gzip
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from organizer.models import Contestant, Event
+from organizer.renderers import ORJSONRenderer, orjson
+from organizer.serializers import ContestantSerializer, EventSerializer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _time(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's JSONRenderer with the orjson renderer on event and contestant list payloads, "
+        "and report gzip/brotli sizes. Run `seed_load` first for realistic data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=200, help="Events in the event-list payload.")
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed; the fast renderer would fall back to DRF's.")
+
+        events = list(
+            Event.objects.select_related('organizer')
+            .prefetch_related('contestants__event')[:options['events']]
+        )
+        if not events:
+            raise CommandError("No events found; run `python manage.py seed_load` first.")
+        contestants = list(Contestant.objects.select_related('event').filter(event=events[0]))
+
+        payloads = {
+            'event-list': EventSerializer(events, many=True).data,
+            'contestant-list': ContestantSerializer(contestants, many=True).data,
+        }
+        stdlib, fast = JSONRenderer(), ORJSONRenderer()
+        iterations = options['iterations']
+
+        for name, data in payloads.items():
+            body = stdlib.render(data)
+            if orjson.loads(fast.render(data)) != orjson.loads(body):
+                self.stdout.write(self.style.WARNING(f"{name}: renderers produced different JSON"))
+
+            drf_ms = _time(lambda: stdlib.render(data), iterations) * 1000
+            orjson_ms = _time(lambda: fast.render(data), iterations) * 1000
+            gzipped = gzip.compress(body, compresslevel=6)
+            sizes = f"raw {len(body):,} B, gzip {len(gzipped):,} B"
+            if brotli is not None:
+                sizes += f", br {len(brotli.compress(body, quality=4)):,} B"
+
+            self.stdout.write(
+                f"{name:<16} drf {drf_ms:8.2f} ms  orjson {orjson_ms:8.2f} ms  "
+                f"({drf_ms / max(orjson_ms, 1e-9):.1f}x)  {sizes}"
+            )
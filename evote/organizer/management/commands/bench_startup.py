@@ -0,0 +1,93 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a fresh worker pays before serving its first request: importing the
+# WSGI/ASGI entry point (which runs django.setup()) and loading the URLconf.
+STARTUP_TARGET_MS = 450
+
+PROBE = """
+import json, os, sys, time
+start = time.perf_counter()
+import evote.{entry}
+booted = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+done = time.perf_counter()
+print(json.dumps({{
+    "boot_ms": (booted - start) * 1000,
+    "urls_ms": (done - booted) * 1000,
+    "modules": len(sys.modules),
+    "drf_yasg": "drf_yasg" in sys.modules,
+}}))
+"""
+
+
+def _probe(entry, api_docs):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'evote.settings'))
+    if api_docs is not None:
+        env['API_DOCS_ENABLED'] = api_docs
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE.format(entry=entry)],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise CommandError(f"evote.{entry} failed to start:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+# Import time spent in each top-level package's own modules, heaviest first.
+def _import_cost_by_package(importtime_log, top):
+    costs = defaultdict(int)
+    for line in importtime_log.splitlines():
+        parts = line.removeprefix('import time:').split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        costs[parts[2].strip().split('.')[0]] += int(parts[0])
+    return sorted(costs.items(), key=lambda item: -item[1])[:top]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold-start time of evote.wsgi/evote.asgi in fresh interpreters (import plus URLconf load), "
+        "list import time by package, and fail if the median exceeds --target-ms."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entry', choices=['wsgi', 'asgi'], nargs='+', default=['wsgi', 'asgi'])
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--top', type=int, default=15, help="Packages to list by import time.")
+        parser.add_argument('--api-docs', choices=['0', '1'], help="Override API_DOCS_ENABLED for the workers.")
+        parser.add_argument('--target-ms', type=float, default=STARTUP_TARGET_MS)
+
+    def handle(self, *args, **options):
+        over_target = []
+        for entry in options['entry']:
+            samples = []
+            for _ in range(options['runs']):
+                sample, importtime_log = _probe(entry, options['api_docs'])
+                samples.append(sample)
+
+            total = statistics.median(s['boot_ms'] + s['urls_ms'] for s in samples)
+            fastest = min(s['boot_ms'] + s['urls_ms'] for s in samples)
+            boot = statistics.median(s['boot_ms'] for s in samples)
+            urls = statistics.median(s['urls_ms'] for s in samples)
+            last = samples[-1]
+            self.stdout.write(
+                f"evote.{entry:<5} median {total:7.1f} ms, best {fastest:.1f} ms  "
+                f"(import {boot:.1f} ms, urlconf {urls:.1f} ms)  "
+                f"{last['modules']} modules, drf_yasg {'loaded' if last['drf_yasg'] else 'not loaded'}"
+            )
+            for package, self_us in _import_cost_by_package(importtime_log, options['top']):
+                self.stdout.write(f"    {self_us / 1000:8.1f} ms  {package}")
+            if total > options['target_ms']:
+                over_target.append(f"evote.{entry} {total:.1f} ms")
+
+        if over_target:
+            raise CommandError(f"Startup over the {options['target_ms']:.0f} ms target: {', '.join(over_target)}")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from organizer.trending import compute_trending_scores
+
+
+class Command(BaseCommand):
+    help = "Recompute trending scores for events whose voting window is open. Run it every minute or so."
+
+    def handle(self, *args, **options):
+        count = compute_trending_scores()
+        self.stdout.write(self.style.SUCCESS(f"Scored {count} active event(s)."))
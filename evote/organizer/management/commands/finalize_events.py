@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from organizer.models import Event
+from organizer.results import RESULTS_FINALIZE_GRACE_SECONDS, finalize_event
+
+
+class Command(BaseCommand):
+    help = "Snapshot final results for every event whose voting window closed more than the grace period ago."
+
+    def handle(self, *args, **options):
+        grace = getattr(settings, 'RESULTS_FINALIZE_GRACE_SECONDS', RESULTS_FINALIZE_GRACE_SECONDS)
+        events = Event.objects.filter(end_date__lte=timezone.now() - timedelta(seconds=grace), result__isnull=True)
+        count = 0
+        for event in events.iterator():
+            finalize_event(event)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Finalized {count} event(s)."))
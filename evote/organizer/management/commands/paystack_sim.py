@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from organizer.paystack_sim import PaystackSimulator
+
+
+class Command(BaseCommand):
+    help = "Run a local Paystack simulator. Point PAYSTACK_BASE_URL at it to load-test payment flows offline."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', default='fixed:0',
+                            help="fixed:<ms>, uniform:<min_ms>:<max_ms> or lognormal:<median_ms>:<sigma>.")
+        parser.add_argument('--error-rate', type=float, default=0.0, help="Share of calls answered with HTTP 500.")
+        parser.add_argument('--timeout-rate', type=float, default=0.0, help="Share of calls left hanging.")
+        parser.add_argument('--timeout-seconds', type=float, default=30.0)
+        parser.add_argument('--decline-rate', type=float, default=0.0,
+                            help="Share of initialized transactions that end up failed.")
+        parser.add_argument('--webhook-url', help="Deliver signed charge.* webhooks to this URL.")
+        parser.add_argument('--webhook-delay', type=float, default=0.0, help="Seconds before a webhook is sent.")
+        parser.add_argument('--seed', type=int)
+
+    def handle(self, *args, **options):
+        simulator = PaystackSimulator(
+            host=options['host'],
+            port=options['port'],
+            secret_key=settings.PAYSTACK_SECRET_KEY,
+            latency=options['latency'],
+            error_rate=options['error_rate'],
+            timeout_rate=options['timeout_rate'],
+            timeout_seconds=options['timeout_seconds'],
+            decline_rate=options['decline_rate'],
+            webhook_url=options['webhook_url'],
+            webhook_delay=options['webhook_delay'],
+            seed=options['seed'],
+        )
+        self.stdout.write(f"Paystack simulator listening on {simulator.base_url}")
+        self.stdout.write(f"Run the API with PAYSTACK_BASE_URL={simulator.base_url}")
+        try:
+            simulator.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            simulator.server.server_close()
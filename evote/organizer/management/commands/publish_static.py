@@ -0,0 +1,43 @@
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from organizer.models import Event
+from organizer.publishing import event_directory, publish_event, publish_root, unpublish_event
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the public JSON snapshots (event, contestant cards, standings and manifest) for every live event "
+        "under STATIC_PUBLISH_ROOT, and remove the snapshots of deleted events."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=uuid.UUID, help="Only publish this event_id; all events by default.")
+
+    def handle(self, *args, **options):
+        if options['event']:
+            event = Event.objects.filter(event_id=options['event']).first()
+            if event is None:
+                raise CommandError(f"Event '{options['event']}' does not exist.")
+            publish_event(event.pk)
+            self.stdout.write(self.style.SUCCESS(f"Published {event_directory(event.event_id)}."))
+            return
+
+        published = 0
+        for event_pk in Event.objects.values_list('pk', flat=True).iterator():
+            if publish_event(event_pk) is not None:
+                published += 1
+
+        live = {str(event_id) for event_id in Event.objects.values_list('event_id', flat=True)}
+        removed = 0
+        events_root = publish_root() / 'events'
+        if events_root.is_dir():
+            for directory in events_root.iterdir():
+                if directory.is_dir() and directory.name not in live:
+                    unpublish_event(directory.name)
+                    removed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Published {published} event(s) under {publish_root()}; removed {removed} stale event(s)."
+        ))
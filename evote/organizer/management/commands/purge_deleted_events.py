@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from organizer.deletion import PURGE_BATCH_SIZE, deleted_events, purge_event
+
+
+class Command(BaseCommand):
+    help = "Remove soft-deleted events together with their contestants, votes and payments."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PURGE_BATCH_SIZE, help="Rows per DELETE statement.")
+        parser.add_argument('--dry-run', action='store_true', help="List the events that would be purged.")
+        parser.add_argument('--loop', action='store_true', help="Keep running, polling every --interval seconds.")
+        parser.add_argument('--interval', type=float, default=60.0)
+
+    def handle(self, *args, **options):
+        while True:
+            for event in deleted_events():
+                if options['dry_run']:
+                    self.stdout.write(f"Would purge {event.event_id} ({event.event_name}), deleted {event.deleted_at:%Y-%m-%d %H:%M}.")
+                    continue
+                counts = purge_event(event, batch_size=options['batch_size'])
+                self.stdout.write(
+                    f"Purged {event.event_id} ({event.event_name}): "
+                    f"{counts['votes']} vote(s), {counts['payments']} payment(s)."
+                )
+            if not options['loop'] or options['dry_run']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,35 @@
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from organizer.models import Event
+from organizer.tallies import find_drift, fix_drift
+
+
+class Command(BaseCommand):
+    help = "Compare Contestant.vote_count with SUM(Vote.quantity) and optionally correct any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=uuid.UUID, help="Only check this event_id; all events by default.")
+        parser.add_argument('--fix', action='store_true', help="Rewrite drifted tallies.")
+
+    def handle(self, *args, **options):
+        event = None
+        if options['event']:
+            event = Event.objects.filter(event_id=options['event']).first()
+            if event is None:
+                raise CommandError(f"Event '{options['event']}' does not exist.")
+
+        drift = find_drift(event)
+        for row in drift:
+            self.stdout.write(
+                f"{row['event_id']} contestant {row['contestant_id']} ({row['contestant_name']}): "
+                f"stored {row['vote_count']}, actual {row['actual']}, drift {row['drift']:+d}"
+            )
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("No drift found."))
+        elif options['fix']:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {fix_drift(drift)} contestant tally(ies)."))
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} contestant(s) drifted; rerun with --fix to correct."))
@@ -0,0 +1,25 @@
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from organizer.archive import ArchiveError, restore_event
+from organizer.models import Event
+
+
+class Command(BaseCommand):
+    help = "Load an archived event's votes and payments back into the hot tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_id', type=uuid.UUID)
+
+    def handle(self, *args, **options):
+        event = Event.objects.filter(event_id=options['event_id']).first()
+        if event is None:
+            raise CommandError(f"Event '{options['event_id']}' does not exist.")
+        try:
+            archive = restore_event(event)
+        except ArchiveError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f"Restored {archive.vote_rows} votes and {archive.payment_rows} payments for {event.event_id}."
+        ))
@@ -0,0 +1,112 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from organizer.models import Event, Contestant, Vote, Payment, SUPPORTED_PROVIDERS
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic organizers, events, contestants, votes and payments for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organizers', type=int, default=10)
+        parser.add_argument('--events', type=int, default=5, help="Events per organizer.")
+        parser.add_argument('--contestants', type=int, default=20, help="Contestants per event.")
+        parser.add_argument('--votes', type=int, default=50, help="Votes per contestant, each with a payment.")
+        parser.add_argument('--closed-fraction', type=float, default=0.2,
+                            help="Share of events whose voting window has already ended.")
+        parser.add_argument('--prefix', default='load', help="Prefix for usernames and payment references.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        batch_size = options['batch_size']
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+
+        if CustomUser.objects.filter(username__startswith=f"{prefix}-").exists():
+            raise CommandError(f"Data with prefix '{prefix}' already exists; pass a different --prefix.")
+
+        # Hashing is deliberately slow, so every seeded organizer shares one hash.
+        password = make_password(f"{prefix}-password")
+
+        with transaction.atomic():
+            organizers = CustomUser.objects.bulk_create([
+                CustomUser(
+                    username=f"{prefix}-organizer-{i}",
+                    email=f"{prefix}-organizer-{i}@example.com",
+                    password=password,
+                    role=CustomUser.Roles.ORGANIZER,
+                    is_active=True,
+                )
+                for i in range(options['organizers'])
+            ], batch_size=batch_size)
+
+            events = []
+            for organizer in organizers:
+                for i in range(options['events']):
+                    closed = rng.random() < options['closed_fraction']
+                    start = now - timedelta(days=rng.randint(10, 30) if closed else rng.randint(0, 3))
+                    end = (now - timedelta(days=rng.randint(1, 9))) if closed else (now + timedelta(days=rng.randint(1, 14)))
+                    events.append(Event(
+                        organizer=organizer,
+                        event_name=f"{organizer.username} event {i}",
+                        start_date=start,
+                        end_date=end,
+                        vote_type='paid',
+                        price_per_vote=Decimal(rng.choice(['0.50', '1.00', '2.00', '5.00'])),
+                    ))
+            events = Event.objects.bulk_create(events, batch_size=batch_size)
+
+            contestants = Contestant.objects.bulk_create([
+                Contestant(
+                    event=event,
+                    contestant_name=f"Contestant {event.pk}-{i}",
+                    bio=f"Synthetic contestant {i} for {event.event_name}.",
+                )
+                for event in events
+                for i in range(options['contestants'])
+            ], batch_size=batch_size)
+
+            # bulk_create skips the post_save tally signal, so totals are tracked here.
+            votes = []
+            for contestant in contestants:
+                for _ in range(options['votes']):
+                    quantity = rng.randint(1, 10)
+                    contestant.vote_count += quantity
+                    votes.append(Vote(
+                        contestant=contestant,
+                        voter_ip=f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                        quantity=quantity,
+                    ))
+            votes = Vote.objects.bulk_create(votes, batch_size=batch_size)
+            Contestant.objects.bulk_update(contestants, ['vote_count'], batch_size=batch_size)
+
+            price_by_contestant = {c.pk: c.event.price_per_vote for c in contestants}
+            providers = SUPPORTED_PROVIDERS
+            Payment.objects.bulk_create([
+                Payment(
+                    vote=vote,
+                    contestant_id=vote.contestant_id,
+                    amount=price_by_contestant[vote.contestant_id] * vote.quantity,
+                    quantity=vote.quantity,
+                    reference=f"{prefix}-{vote.pk}",
+                    phone_number=f"055{rng.randint(1000000, 9999999)}",
+                    provider=rng.choice(providers),
+                    status='success',
+                    paid_at=vote.timestamp,
+                )
+                for vote in votes
+            ], batch_size=batch_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(organizers)} organizers, {len(events)} events, "
+            f"{len(contestants)} contestants and {len(votes)} votes/payments."
+        ))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from organizer.models import QueuedVerification
+from organizer.payments import settle_queued_verifications
+
+
+class Command(BaseCommand):
+    help = "Settle payment verifications that were queued while Paystack was unavailable."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--loop', action='store_true', help="Keep running, polling every --interval seconds.")
+        parser.add_argument('--interval', type=float, default=15.0)
+
+    def handle(self, *args, **options):
+        while True:
+            settled, failed = settle_queued_verifications(limit=options['batch_size'])
+            remaining = QueuedVerification.objects.count()
+            self.stdout.write(f"Settled {settled}, rejected {failed}, {remaining} still queued.")
+            if not options['loop']:
+                break
+            if not remaining or not settled:
+                time.sleep(options['interval'])
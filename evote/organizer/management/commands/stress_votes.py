@@ -0,0 +1,159 @@
+import multiprocessing
+import random
+import statistics
+import threading
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+# Worker processes are spawned, so they import this module before Django is
+# set up: models and the payment path are imported inside the functions.
+
+
+def _record_votes(references, results):
+    from django.db import OperationalError
+    from organizer.models import Payment
+    from organizer.payments import PaymentError, settle_payment
+
+    try:
+        for reference, amount in references:
+            start = time.perf_counter()
+            try:
+                # Same reads and writes as verify_payment, minus the Paystack call.
+                payment = Payment.objects.select_related('contestant').get(reference=reference)
+                settle_payment(reference, {"status": "success", "amount": amount}, None, payment)
+                outcome = 'recorded'
+            except PaymentError:
+                outcome = 'rejected'
+            except OperationalError:
+                # "database is locked": the verification fails and the voter retries.
+                outcome = 'db_error'
+            results.append((outcome, time.perf_counter() - start))
+    finally:
+        connection.close()
+
+
+def _run_threads(chunks):
+    results = []
+    threads = [threading.Thread(target=_record_votes, args=(chunk, results)) for chunk in chunks]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def _process_main(chunks):
+    import django
+    django.setup()
+    return _run_threads(chunks)
+
+
+class Command(BaseCommand):
+    help = (
+        "Record thousands of votes concurrently from several processes and threads through the payment "
+        "settlement path, then check every contestant's vote_count against SUM(Vote.quantity) and report "
+        "throughput. Fails if a tally is off or any vote hits a database error. Needs a file-backed database; "
+        "the test event is purged afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--votes', type=int, default=2000)
+        parser.add_argument('--processes', type=int, default=4)
+        parser.add_argument('--threads', type=int, default=8, help="Threads per process.")
+        parser.add_argument('--contestants', type=int, default=1,
+                            help="Contestants sharing the votes; 1 makes every vote contend for one row.")
+        parser.add_argument('--max-quantity', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true', help="Keep the test event instead of purging it.")
+
+    def handle(self, *args, **options):
+        from django.db.models import Sum
+        from accounts.models import CustomUser
+        from organizer.deletion import purge_event
+        from organizer.models import Contestant, Event, Payment, Vote
+
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            raise CommandError("stress_votes needs a database file; an in-memory SQLite database is per-connection.")
+
+        rng = random.Random(options['seed'])
+        tag = uuid.uuid4().hex[:8]
+        now = timezone.now()
+        organizer = CustomUser.objects.create_user(f"stress-{tag}@example.com", f"stress-{tag}", password=None)
+        event = Event.objects.create(
+            organizer=organizer, event_name=f"stress {tag}", vote_type='paid', price_per_vote=Decimal('1.00'),
+            start_date=now - timedelta(hours=1), end_date=now + timedelta(days=1),
+        )
+        contestants = Contestant.objects.bulk_create([
+            Contestant(event=event, contestant_name=f"stress {tag} {i}") for i in range(options['contestants'])
+        ])
+        payments = Payment.objects.bulk_create([
+            Payment(
+                contestant=rng.choice(contestants),
+                amount=Decimal(quantity),
+                quantity=quantity,
+                reference=f"stress-{tag}-{i}",
+                status='pending',
+            )
+            for i, quantity in enumerate(rng.randint(1, options['max_quantity']) for _ in range(options['votes']))
+        ], batch_size=2000)
+
+        workers = options['processes'] * options['threads']
+        references = [(payment.reference, int(payment.amount * 100)) for payment in payments]
+        chunks = [references[i::workers] for i in range(workers)]
+        per_process = [chunks[p::options['processes']] for p in range(options['processes'])]
+
+        self.stdout.write(
+            f"Recording {len(references)} votes for {len(contestants)} contestant(s) from "
+            f"{options['processes']} process(es) x {options['threads']} thread(s) on {connection.vendor}..."
+        )
+        connections.close_all()
+        start = time.perf_counter()
+        if options['processes'] > 1:
+            with multiprocessing.get_context('spawn').Pool(options['processes']) as pool:
+                results = [r for process_results in pool.map(_process_main, per_process) for r in process_results]
+        else:
+            results = _run_threads(per_process[0])
+        elapsed = time.perf_counter() - start
+
+        outcomes = {}
+        for outcome, _ in results:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        latencies = sorted(seconds * 1000 for outcome, seconds in results if outcome == 'recorded')
+
+        tallies = dict(Contestant.objects.filter(event=event).values_list('pk', 'vote_count'))
+        sums = dict(
+            Vote.objects.filter(contestant__event=event).values('contestant')
+            .annotate(total=Sum('quantity')).values_list('contestant', 'total')
+        )
+        settled = Payment.objects.filter(contestant__event=event, status='success').aggregate(total=Sum('quantity'))['total'] or 0
+        mismatched = {pk: (count, sums.get(pk, 0)) for pk, count in tallies.items() if count != sums.get(pk, 0)}
+
+        recorded = outcomes.get('recorded', 0)
+        self.stdout.write(
+            f"{recorded} recorded, {outcomes.get('db_error', 0)} database errors, "
+            f"{outcomes.get('rejected', 0)} rejected in {elapsed:.2f} s ({recorded / elapsed:.0f} votes/s)"
+        )
+        if latencies:
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            self.stdout.write(f"latency p50 {statistics.median(latencies):.1f} ms, p99 {p99:.1f} ms")
+        self.stdout.write(
+            f"vote_count total {sum(tallies.values())}, SUM(Vote.quantity) {sum(sums.values())}, "
+            f"settled payments {settled}"
+        )
+
+        if not options['keep']:
+            purge_event(event)
+            organizer.delete()
+
+        if mismatched or sum(sums.values()) != settled:
+            details = ", ".join(f"contestant {pk}: vote_count {count} != {total}" for pk, (count, total) in mismatched.items())
+            raise CommandError(f"Tallies are wrong: {details or 'votes do not match settled payments'}")
+        if outcomes.get('db_error'):
+            raise CommandError(f"{outcomes['db_error']} vote(s) failed with database errors.")
+        self.stdout.write(self.style.SUCCESS("Tallies match."))
@@ -0,0 +1,264 @@
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+# Buckets are in seconds for latency histograms and plain counts for query histograms.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+METRICS_FLUSH_SECONDS = 1.0
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class MetricsRegistry:
+    # A small in-process registry. With METRICS_MULTIPROC_DIR set, every worker
+    # also writes its numbers to its own file there and a scrape of any worker
+    # adds them all up; otherwise only the serving process is reported.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = defaultdict(float)
+        # Gauges keep the time they were set, so merging workers keeps the latest.
+        self._gauges = {}
+        self._help = {}
+        self._timer = None
+        self._file = None
+
+    def describe(self, name, kind, help_text):
+        self._help[name] = (kind, help_text)
+
+    def observe(self, name, labels, value, buckets=LATENCY_BUCKETS):
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+        self._schedule_flush()
+
+    def inc(self, name, labels, value=1):
+        with self._lock:
+            self._counters[(name, labels)] += value
+        self._schedule_flush()
+
+    def set_gauge(self, name, labels, value):
+        with self._lock:
+            self._gauges[(name, labels)] = (value, time.time())
+        self._schedule_flush()
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def _snapshot(self):
+        with self._lock:
+            return {
+                "counters": [[name, labels, value] for (name, labels), value in self._counters.items()],
+                "gauges": [[name, labels, value, at] for (name, labels), (value, at) in self._gauges.items()],
+                "histograms": [
+                    [name, labels, h.buckets, list(h.counts), h.sum, h.count]
+                    for (name, labels), h in self._histograms.items()
+                ],
+            }
+
+    # Files are named per process start rather than per pid, so a restarted
+    # worker that reuses a pid does not overwrite its predecessor's counts.
+    def _path(self, directory):
+        if self._file is None or self._file[0] != os.getpid():
+            self._file = (os.getpid(), f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json")
+        return directory / self._file[1]
+
+    def _schedule_flush(self):
+        if multiproc_dir() is None:
+            return
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(METRICS_FLUSH_SECONDS, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._timer = None
+        directory = multiproc_dir()
+        if directory is None:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(directory)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(json.dumps(self._snapshot()))
+        os.replace(tmp, path)
+
+    # Sums counters and histograms over every worker's file; gauges report the
+    # value set most recently by any worker.
+    def _collect(self):
+        directory = multiproc_dir()
+        if directory is None:
+            return [self._snapshot()]
+        self.flush()
+        snapshots = []
+        for path in directory.glob('*.json'):
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (FileNotFoundError, ValueError):
+                continue
+        return snapshots
+
+    def render(self):
+        counters = defaultdict(float)
+        gauges = {}
+        histograms = {}
+        for snapshot in self._collect():
+            for name, labels, value in snapshot["counters"]:
+                counters[(name, _labels(labels))] += value
+            for name, labels, value, at in snapshot["gauges"]:
+                key = (name, _labels(labels))
+                if key not in gauges or at > gauges[key][1]:
+                    gauges[key] = (value, at)
+            for name, labels, buckets, counts, total, count in snapshot["histograms"]:
+                key = (name, _labels(labels))
+                if key not in histograms:
+                    histograms[key] = [tuple(buckets), [0] * len(buckets), 0.0, 0]
+                merged = histograms[key]
+                merged[1] = [a + b for a, b in zip(merged[1], counts)]
+                merged[2] += total
+                merged[3] += count
+        histograms = [(key, buckets, counts, total, count) for key, (buckets, counts, total, count) in histograms.items()]
+        counters = list(counters.items())
+        gauges = [(key, value) for key, (value, _) in gauges.items()]
+
+        lines = []
+        seen = set()
+
+        def header(name, default_kind):
+            if name in seen:
+                return
+            seen.add(name)
+            kind, help_text = self._help.get(name, (default_kind, ''))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in sorted(counters):
+            header(name, 'counter')
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for (name, labels), value in sorted(gauges):
+            header(name, 'gauge')
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for (name, labels), buckets, counts, total, count in sorted(histograms, key=lambda h: h[0]):
+            header(name, 'histogram')
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                le = labels + (('le', _format_value(bound)),)
+                lines.append(f"{name}_bucket{_format_labels(le)} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def multiproc_dir():
+    directory = getattr(settings, 'METRICS_MULTIPROC_DIR', '')
+    return Path(directory) if directory else None
+
+
+def _labels(labels):
+    return tuple(tuple(pair) for pair in labels)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+
+
+def _after_fork():
+    # The flush timer thread does not survive fork(); the child gets its own file.
+    registry._lock = threading.Lock()
+    registry._timer = None
+    registry._file = None
+
+
+def _flush_at_exit():
+    if registry._timer is not None:
+        registry.flush()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+atexit.register(_flush_at_exit)
+
+registry.describe('evote_http_requests_total', 'counter', 'HTTP requests by route, method and status.')
+registry.describe('evote_http_request_duration_seconds', 'histogram', 'HTTP request latency by route.')
+registry.describe('evote_db_queries_per_request', 'histogram', 'SQL queries issued per request by route.')
+registry.describe('evote_db_queries_total', 'counter', 'SQL queries issued by route.')
+registry.describe('evote_db_query_duration_seconds_total', 'counter', 'Time spent in SQL by route.')
+registry.describe('evote_paystack_request_duration_seconds', 'histogram', 'Outbound Paystack call latency.')
+registry.describe('evote_verification_queue_depth', 'gauge', 'Payment verifications waiting for Paystack to recover.')
+registry.describe('evote_paystack_requests_total', 'counter', 'Outbound Paystack calls by operation and outcome.')
+registry.describe('evote_fraud_flags_total', 'counter', 'Voters flagged for burst voting, by kind (ip, phone).')
+registry.describe('evote_cache_requests_total', 'counter', 'Event cache lookups by cache and result (hit, miss, bypass).')
+
+
+def observe_request(route, method, status_code, duration, query_count, query_time):
+    registry.inc('evote_http_requests_total', (('route', route), ('method', method), ('status', str(status_code))))
+    registry.observe('evote_http_request_duration_seconds', (('route', route), ('method', method)), duration)
+    registry.observe('evote_db_queries_per_request', (('route', route),), query_count, buckets=QUERY_COUNT_BUCKETS)
+    registry.inc('evote_db_queries_total', (('route', route),), query_count)
+    registry.inc('evote_db_query_duration_seconds_total', (('route', route),), query_time)
+
+
+def observe_paystack(operation, outcome, duration):
+    registry.inc('evote_paystack_requests_total', (('operation', operation), ('outcome', outcome)))
+    registry.observe('evote_paystack_request_duration_seconds', (('operation', operation),), duration)
+
+
+def observe_cache(name, result, count=1):
+    registry.inc('evote_cache_requests_total', (('cache', name), ('result', result)), count)
+
+
+def observe_fraud_flag(kind):
+    registry.inc('evote_fraud_flags_total', (('kind', kind),))
@@ -0,0 +1,97 @@
+import re
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+from .metrics import observe_request
+
+
+class _QueryTracker:
+    __slots__ = ('count', 'duration')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+# Records latency, status and SQL usage for every request, labelled by the
+# matched URL pattern rather than the raw path so cardinality stays bounded.
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        tracker = _QueryTracker()
+        start = time.perf_counter()
+        with connection.execute_wrapper(tracker):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match is not None else 'unmatched'
+        observe_request(route, request.method, response.status_code, duration, tracker.count, tracker.duration)
+        return response
+
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+_accepts_br = re.compile(r'\bbr\b')
+_accepts_gzip = re.compile(r'\bgzip\b')
+# HTML pages (the admin, the browsable API) carry CSRF tokens next to reflected
+# input, which compression would expose to BREACH; only API JSON is compressed.
+COMPRESSIBLE_CONTENT_TYPES = ('application/json',)
+
+
+# Compresses API JSON responses above RESPONSE_COMPRESSION_MIN_BYTES. Like
+# Django's GZipMiddleware, but with a useful threshold for API payloads and
+# brotli when the client and server both support it.
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_bytes = getattr(settings, 'RESPONSE_COMPRESSION_MIN_BYTES', 1024)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in COMPRESSIBLE_CONTENT_TYPES:
+            return response
+        if len(response.content) < self.min_bytes:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is not None and _accepts_br.search(accept):
+            compressed, encoding = brotli.compress(response.content, quality=4), 'br'
+        elif _accepts_gzip.search(accept):
+            compressed, encoding = compress_string(response.content), 'gzip'
+        else:
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        if response.has_header('ETag'):
+            response['ETag'] = re.sub(r'^"', 'W/"', response['ETag'])
+        return response
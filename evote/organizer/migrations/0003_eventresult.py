@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0002_payment_phone_number_payment_provider_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_votes', models.PositiveBigIntegerField(default=0)),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('payload', models.JSONField()),
+                ('finalized_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='result', to='organizer.event')),
+            ],
+        ),
+    ]
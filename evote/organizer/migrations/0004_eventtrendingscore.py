@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0003_eventresult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventTrendingScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(db_index=True, default=0)),
+                ('recent_votes', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField()),
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='trending', to='organizer.event')),
+            ],
+        ),
+    ]
@@ -0,0 +1,107 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# Contestants are stored at rowid = id * 2 and events at rowid = id * 2 + 1,
+# so every trigger can address its row through the rowid index.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE organizer_search USING fts5(
+        name, detail, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER organizer_search_contestant_ai AFTER INSERT ON organizer_contestant BEGIN
+        INSERT INTO organizer_search(rowid, name, detail)
+        VALUES (new.id * 2, new.contestant_name, coalesce(new.bio, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER organizer_search_contestant_au AFTER UPDATE OF contestant_name, bio ON organizer_contestant BEGIN
+        UPDATE organizer_search SET name = new.contestant_name, detail = coalesce(new.bio, '')
+        WHERE rowid = new.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER organizer_search_contestant_ad AFTER DELETE ON organizer_contestant BEGIN
+        DELETE FROM organizer_search WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER organizer_search_event_ai AFTER INSERT ON organizer_event BEGIN
+        INSERT INTO organizer_search(rowid, name, detail) VALUES (new.id * 2 + 1, new.event_name, '');
+    END
+    """,
+    """
+    CREATE TRIGGER organizer_search_event_au AFTER UPDATE OF event_name ON organizer_event BEGIN
+        UPDATE organizer_search SET name = new.event_name WHERE rowid = new.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER organizer_search_event_ad AFTER DELETE ON organizer_event BEGIN
+        DELETE FROM organizer_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+    """
+    INSERT INTO organizer_search(rowid, name, detail)
+    SELECT id * 2, contestant_name, coalesce(bio, '') FROM organizer_contestant
+    """,
+    """
+    INSERT INTO organizer_search(rowid, name, detail)
+    SELECT id * 2 + 1, event_name, '' FROM organizer_event
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS organizer_search_contestant_ai",
+    "DROP TRIGGER IF EXISTS organizer_search_contestant_au",
+    "DROP TRIGGER IF EXISTS organizer_search_contestant_ad",
+    "DROP TRIGGER IF EXISTS organizer_search_event_ai",
+    "DROP TRIGGER IF EXISTS organizer_search_event_au",
+    "DROP TRIGGER IF EXISTS organizer_search_event_ad",
+    "DROP TABLE IF EXISTS organizer_search",
+]
+
+# Postgres keeps expression indexes up to date by itself; the expressions
+# must match the ones used in organizer/search.py exactly.
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX organizer_contestant_search_idx ON organizer_contestant
+    USING GIN (to_tsvector('simple', contestant_name || ' ' || coalesce(bio, '')))
+    """,
+    """
+    CREATE INDEX organizer_event_search_idx ON organizer_event
+    USING GIN (to_tsvector('simple', event_name))
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS organizer_contestant_search_idx",
+    "DROP INDEX IF EXISTS organizer_event_search_idx",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        try:
+            for statement in statements:
+                schema_editor.execute(statement)
+        except OperationalError:
+            # SQLite built without FTS5: search falls back to prefix matching.
+            if schema_editor.connection.vendor != 'sqlite' or statements is SQLITE_BACKWARD:
+                raise
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0004_eventtrendingscore'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_payment_contestant(apps, schema_editor):
+    Payment = apps.get_model('organizer', 'Payment')
+    Vote = apps.get_model('organizer', 'Vote')
+    Payment.objects.filter(contestant__isnull=True, vote__isnull=False).update(
+        contestant=models.Subquery(Vote.objects.filter(pk=models.OuterRef('vote')).values('contestant')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='authorization_url',
+            field=models.URLField(blank=True, max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='contestant',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='payments', to='organizer.contestant'),
+        ),
+        migrations.AlterField(
+            model_name='payment',
+            name='vote',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='payment', to='organizer.vote'),
+        ),
+        migrations.RunPython(backfill_payment_contestant, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['phone_number', 'contestant', 'quantity', 'created_at'], name='payment_init_dedup_idx'),
+        ),
+    ]
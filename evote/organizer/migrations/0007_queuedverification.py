@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0006_payment_pending_init'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedVerification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reference', models.CharField(max_length=255, unique=True)),
+                ('voter_ip', models.GenericIPAddressField(blank=True, null=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.CharField(blank=True, default='', max_length=255)),
+                ('queued_at', models.DateTimeField(auto_now_add=True)),
+                ('last_attempt_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
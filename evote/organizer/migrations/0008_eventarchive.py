@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0007_queuedverification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('segment_path', models.CharField(max_length=500)),
+                ('checksum', models.CharField(max_length=64)),
+                ('vote_rows', models.PositiveIntegerField(default=0)),
+                ('payment_rows', models.PositiveIntegerField(default=0)),
+                ('total_votes', models.PositiveBigIntegerField(default=0)),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='archive', to='organizer.event')),
+            ],
+        ),
+    ]
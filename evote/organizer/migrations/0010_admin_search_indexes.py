@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0009_event_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['voter_ip'], name='vote_voter_ip_idx'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import migrations, models
+
+import utils.generate_utils
+from utils.migration_utils import copy_uuid_column
+
+# Rebuilding organizer_event on SQLite drops the search triggers from 0005.
+SQLITE_EVENT_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS organizer_search_event_ai AFTER INSERT ON organizer_event BEGIN
+        INSERT INTO organizer_search(rowid, name, detail) VALUES (new.id * 2 + 1, new.event_name, '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS organizer_search_event_au AFTER UPDATE OF event_name ON organizer_event BEGIN
+        UPDATE organizer_search SET name = new.event_name WHERE rowid = new.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS organizer_search_event_ad AFTER DELETE ON organizer_event BEGIN
+        DELETE FROM organizer_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+
+def copy_event_ids(apps, schema_editor):
+    copy_uuid_column(apps, schema_editor, 'organizer', 'Event', 'event_id', 'event_uuid')
+
+
+def restore_search_triggers(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'organizer_search'")
+        if cursor.fetchone() is None:
+            return
+        for statement in SQLITE_EVENT_TRIGGERS:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    # Batches commit one at a time so a large table is never locked for the whole copy.
+    atomic = False
+
+    dependencies = [
+        ('organizer', '0010_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='event_uuid',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.RunPython(copy_event_ids, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='event',
+            name='event_id',
+        ),
+        migrations.RenameField(
+            model_name='event',
+            old_name='event_uuid',
+            new_name='event_id',
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='event_id',
+            field=models.UUIDField(default=utils.generate_utils.generate_ids, editable=False, unique=True),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0011_event_uuid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FraudFlag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('ip', 'Voter IP'), ('phone', 'Phone number')], max_length=10)),
+                ('value', models.CharField(max_length=64)),
+                ('peak_count', models.PositiveIntegerField(default=0)),
+                ('window_seconds', models.PositiveIntegerField()),
+                ('times_flagged', models.PositiveIntegerField(default=1)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('dismissed', 'Dismissed'), ('confirmed', 'Confirmed')], db_index=True, default='open', max_length=10)),
+                ('first_flagged_at', models.DateTimeField(auto_now_add=True)),
+                ('last_flagged_at', models.DateTimeField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fraud_flags', to='organizer.event')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('event', 'kind', 'value'), name='fraudflag_event_kind_value_uniq')],
+            },
+        ),
+    ]
@@ -2,6 +2,12 @@ from django.db import models
 from accounts.models import CustomUser  # adjust if the user model is in a different app
 from utils.generate_utils import generate_ids  # or define your own
 
+class EventManager(models.Manager):
+    # Soft-deleted events are invisible everywhere; Event.all_objects still sees them.
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Event(models.Model):
     VOTE_TYPE_CHOICES = [
         ('free', 'Free'),
@@ -9,7 +15,7 @@ class Event(models.Model):
     ]
 
     organizer = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='events')
-    event_id = models.CharField(default=generate_ids, unique=True, editable=False)
+    event_id = models.UUIDField(default=generate_ids, unique=True, editable=False)
     event_name = models.CharField(max_length=255)
     logo_url = models.URLField(blank=True, null=True)
     start_date = models.DateTimeField()
@@ -19,6 +25,10 @@ class Event(models.Model):
     price_per_vote = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     date_created = models.DateTimeField(auto_now_add=True)
     date_updated = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = EventManager()
+    all_objects = models.Manager()
 
 
     def __str__(self):
@@ -44,17 +54,28 @@ class Vote(models.Model):
     voter_ip = models.GenericIPAddressField(null=True, blank=True)
     quantity = models.PositiveIntegerField(default=1)
 
+    class Meta:
+        indexes = [
+            # Exact voter_ip search in the admin.
+            models.Index(fields=['voter_ip'], name='vote_voter_ip_idx'),
+        ]
+
     def __str__(self):
         return f"{self.quantity} vote(s) for {self.contestant.contestant_name} at {self.timestamp}"
 
 
+# Mobile Money networks Paystack is asked to charge.
+SUPPORTED_PROVIDERS = ['mtn', 'vodafone', 'airteltigo']
+
+
 class Payment(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('success', 'Success'),
         ('failed', 'Failed'),
     ]
-    vote = models.OneToOneField(Vote, on_delete=models.CASCADE, related_name='payment')
+    vote = models.OneToOneField(Vote, on_delete=models.CASCADE, related_name='payment', null=True, blank=True)
+    contestant = models.ForeignKey(Contestant, on_delete=models.CASCADE, related_name='payments', null=True, blank=True)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     quantity = models.PositiveIntegerField()
     reference = models.CharField(max_length=255, unique=True)
@@ -62,11 +83,103 @@ class Payment(models.Model):
 
     provider = models.CharField(max_length=20, blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    authorization_url = models.URLField(max_length=500, blank=True, null=True)
     paid_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Finds an in-flight initialization for the same voter, contestant and quantity.
+            models.Index(fields=['phone_number', 'contestant', 'quantity', 'created_at'], name='payment_init_dedup_idx'),
+        ]
+
 
     def __str__(self):
         return f"{self.reference} - {self.status}"
 
+
+
+class EventResult(models.Model):
+    # Written once when an event closes and never updated afterwards.
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, related_name='result')
+    total_votes = models.PositiveBigIntegerField(default=0)
+    total_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    payload = models.JSONField()
+    finalized_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Final results - {self.event.event_name}"
+
+
+class EventTrendingScore(models.Model):
+    # Refreshed periodically by `manage.py compute_trending` so the discovery
+    # endpoint never has to aggregate the vote table.
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, related_name='trending')
+    score = models.FloatField(default=0, db_index=True)
+    recent_votes = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.event.event_name} - {self.score}"
+
+
+class QueuedVerification(models.Model):
+    # Verifications accepted while Paystack was unavailable, settled later by
+    # `manage.py settle_payments`.
+    reference = models.CharField(max_length=255, unique=True)
+    voter_ip = models.GenericIPAddressField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.CharField(max_length=255, blank=True, default='')
+    queued_at = models.DateTimeField(auto_now_add=True)
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.reference} - queued"
+
+
+class EventArchive(models.Model):
+    # Summary left behind when an event's votes and payments are moved out of
+    # the hot tables into a compressed NDJSON segment on disk.
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, related_name='archive')
+    segment_path = models.CharField(max_length=500)
+    checksum = models.CharField(max_length=64)
+    vote_rows = models.PositiveIntegerField(default=0)
+    payment_rows = models.PositiveIntegerField(default=0)
+    total_votes = models.PositiveBigIntegerField(default=0)
+    total_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archive - {self.event.event_name}"
+
+
+class FraudFlag(models.Model):
+    # Raised by fraud.py when one IP or phone number records a burst of votes
+    # for an event; kept for an organizer or admin to review.
+    KIND_CHOICES = [
+        ('ip', 'Voter IP'),
+        ('phone', 'Phone number'),
+    ]
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('dismissed', 'Dismissed'),
+        ('confirmed', 'Confirmed'),
+    ]
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='fraud_flags')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value = models.CharField(max_length=64)
+    peak_count = models.PositiveIntegerField(default=0)
+    window_seconds = models.PositiveIntegerField()
+    times_flagged = models.PositiveIntegerField(default=1)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open', db_index=True)
+    first_flagged_at = models.DateTimeField(auto_now_add=True)
+    last_flagged_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'kind', 'value'], name='fraudflag_event_kind_value_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.value} - {self.event.event_name}"
@@ -0,0 +1,346 @@
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import paystack
+from .caching import VOTES, bump_versions_on_commit
+from .fraud import record_votes_on_commit
+from .publishing import schedule_publish_on_commit
+from .receipts import receipt_for
+from .voting import get_voting_params, voting_closed_reason
+from .models import Contestant, EventResult, Payment, QueuedVerification, Vote
+
+PAYMENT_INIT_DEDUP_SECONDS = 120
+PAYMENT_VERIFY_CONCURRENCY = 8
+INIT_CACHE_KEY = "evote:payinit:{phone}:{contestant_id}:{quantity}:{provider}"
+
+
+class PaymentError(Exception):
+    def __init__(self, message, status_code, details=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.details = details
+
+
+def _dedup_window():
+    return getattr(settings, 'PAYMENT_INIT_DEDUP_SECONDS', PAYMENT_INIT_DEDUP_SECONDS)
+
+
+def _init_cache_key(contestant_id, phone, quantity, provider):
+    return INIT_CACHE_KEY.format(phone=phone, contestant_id=contestant_id, quantity=quantity, provider=provider)
+
+
+# A payment that is settled or failed must not be handed out again as the
+# in-flight initialization for the next identical purchase.
+def _forget_initialization(payment):
+    cache.delete(_init_cache_key(payment.contestant_id, payment.phone_number, payment.quantity, payment.provider))
+
+
+def find_inflight_initialization(contestant_id, phone, quantity, provider):
+    key = _init_cache_key(contestant_id, phone, quantity, provider)
+    existing = cache.get(key)
+    if existing is None:
+        since = timezone.now() - timezone.timedelta(seconds=_dedup_window())
+        existing = (
+            Payment.objects.filter(
+                phone_number=phone, contestant_id=contestant_id, quantity=quantity, created_at__gte=since,
+                provider=provider, status='pending', authorization_url__isnull=False,
+            )
+            .order_by('-created_at')
+            .values('reference', 'authorization_url')
+            .first()
+        )
+        if existing is not None:
+            cache.set(key, existing, _dedup_window())
+    return existing
+
+
+def _check_voting_open(contestant_id, at):
+    params = get_voting_params(contestant_id)
+    if params is None:
+        raise PaymentError("Invalid contestant.", 404)
+    reason = voting_closed_reason(params, at)
+    if reason is not None:
+        raise PaymentError(reason, 403)
+    return params
+
+
+# Once final results are snapshotted a vote can no longer be added to them;
+# the payment stays pending for the organizer to refund.
+def _check_not_finalized(event_pk):
+    if EventResult.objects.filter(event_id=event_pk).exists():
+        raise PaymentError("Results for this event are already final.", 403)
+
+
+# Stores a pending Payment before calling Paystack, so verification becomes a
+# keyed status update. Repeated taps on "pay" within the dedup window get the
+# same authorization URL back without another upstream call.
+def initialize_payment(contestant_id, phone, quantity, provider):
+    params = _check_voting_open(contestant_id, timezone.now())
+    existing = find_inflight_initialization(contestant_id, phone, quantity, provider)
+    if existing is not None:
+        return existing
+    # Refuse before writing anything, so an open breaker leaves no failed rows behind.
+    paystack.ensure_available("initialize")
+
+    price_per_vote = params.price_per_vote or Decimal('0')
+    payment = Payment.objects.create(
+        contestant_id=contestant_id,
+        amount=price_per_vote * quantity,
+        quantity=quantity,
+        reference=uuid.uuid4().hex,
+        phone_number=phone,
+        provider=provider,
+        status='pending',
+    )
+
+    data = {
+        "email": f"{phone}@votemomo.app",  # synthetic email for Paystack
+        "amount": int(payment.amount * 100),
+        "reference": payment.reference,
+        "channels": ["mobile_money"],
+        "mobile_money": {
+            "phone": phone,
+            "provider": provider
+        },
+        "metadata": {
+            "contestant_id": contestant_id,
+            "quantity": quantity,
+            "phone_number": phone,
+            "provider": provider
+        }
+    }
+
+    try:
+        response = paystack.initialize_transaction(data)
+        body = paystack.read_json(response)
+    except paystack.PaystackUnavailable:
+        Payment.objects.filter(pk=payment.pk).update(status='failed')
+        raise
+
+    if response.status_code != 200:
+        Payment.objects.filter(pk=payment.pk).update(status='failed')
+        raise PaymentError("Failed to initiate payment.", 502, details=body)
+
+    authorization_url = body.get("data", {}).get("authorization_url")
+    Payment.objects.filter(pk=payment.pk).update(authorization_url=authorization_url)
+
+    result = {"reference": payment.reference, "authorization_url": authorization_url}
+    cache.set(_init_cache_key(contestant_id, phone, quantity, provider), result, _dedup_window())
+    return result
+
+
+def _payment_from_metadata(reference, data):
+    # Transactions initialized before pending payments were stored locally
+    # only exist on Paystack, so they are rebuilt from the metadata.
+    metadata = data.get("metadata") or {}
+    try:
+        contestant = Contestant.objects.select_related('event').get(id=metadata.get("contestant_id"))
+    except (Contestant.DoesNotExist, ValueError, TypeError):
+        raise PaymentError("Invalid contestant.", 404)
+
+    try:
+        with transaction.atomic():
+            return Payment.objects.create(
+                contestant=contestant,
+                amount=Decimal(data["amount"]) / 100,
+                quantity=int(metadata.get("quantity", 1)),
+                reference=reference,
+                phone_number=metadata.get("phone_number"),
+                provider=metadata.get("provider"),
+                status='pending',
+            )
+    except IntegrityError:
+        raise PaymentError("Payment already verified.", 409)
+
+
+def _check_transaction(data, payment):
+    if data.get("status") != "success":
+        if payment is not None and data.get("status") in ("failed", "abandoned", "reversed"):
+            Payment.objects.filter(pk=payment.pk, status='pending').update(status='failed')
+            _forget_initialization(payment)
+        raise PaymentError("Payment not successful.", 402)
+
+    if payment is not None and data.get("amount") != int(payment.amount * 100):
+        Payment.objects.filter(pk=payment.pk, status='pending').update(status='failed')
+        _forget_initialization(payment)
+        raise PaymentError("Paid amount does not match the initialized payment.", 400)
+
+    return parse_datetime(data.get("paid_at") or "") or timezone.now()
+
+
+def settle_payment(reference, data, voter_ip, payment=None):
+    paid_at = _check_transaction(data, payment)
+
+    with transaction.atomic():
+        if payment is None:
+            payment = _payment_from_metadata(reference, data)
+        # Votes count when the money moved; payments outside the window stay
+        # pending for the organizer to refund.
+        params = _check_voting_open(payment.contestant_id, paid_at)
+        _check_not_finalized(params.event_pk)
+
+        # The conditional update makes settling idempotent under concurrent verifications.
+        claimed = Payment.objects.filter(pk=payment.pk, status='pending').update(status='success', paid_at=paid_at)
+        if not claimed:
+            raise PaymentError("Payment already verified.", 409)
+        _forget_initialization(payment)
+
+        vote = Vote.objects.create(
+            contestant=payment.contestant,
+            voter_ip=voter_ip,
+            quantity=payment.quantity,
+        )
+        Payment.objects.filter(pk=payment.pk).update(vote=vote)
+        record_votes_on_commit(payment.contestant.event_id, [(voter_ip, payment.phone_number)])
+
+    return payment, vote
+
+
+def verify_payment(reference, voter_ip):
+    payment = Payment.objects.select_related('contestant').filter(reference=reference).first()
+    if payment is not None and payment.status == 'success':
+        raise PaymentError("Payment already verified.", 409)
+
+    response = paystack.verify_transaction(reference)
+    result = paystack.read_json(response)
+    if response.status_code != 200 or not result.get("status"):
+        raise PaymentError("Verification failed.", 400, details=result)
+
+    return settle_payment(reference, result["data"], voter_ip, payment)
+
+
+def _fetch_transaction(reference):
+    # Runs in a worker thread, so it must not touch the database.
+    try:
+        response = paystack.verify_transaction(reference)
+        result = paystack.read_json(response)
+    except paystack.PaystackUnavailable as exc:
+        return reference, None, exc
+    if response.status_code != 200 or not result.get("status"):
+        return reference, None, PaymentError("Verification failed.", 400, details=result)
+    return reference, result["data"], None
+
+
+def _outcome(reference, status, message, **extra):
+    return dict({"reference": reference, "status": status, "message": message}, **extra)
+
+
+# Verifies many references at once: one query finds what is already settled,
+# the rest are checked against Paystack concurrently, and every resulting vote
+# is written in one transaction with one tally update per contestant.
+def verify_payments_batch(references, voter_ip):
+    references = list(dict.fromkeys(references))
+    payments = {p.reference: p for p in Payment.objects.select_related('contestant').filter(reference__in=references)}
+    outcomes = {}
+
+    to_verify = []
+    for reference in references:
+        payment = payments.get(reference)
+        if payment is not None and payment.status == 'success':
+            outcomes[reference] = _outcome(reference, "already_verified", "Payment already verified.")
+        else:
+            to_verify.append(reference)
+
+    workers = getattr(settings, 'PAYMENT_VERIFY_CONCURRENCY', PAYMENT_VERIFY_CONCURRENCY)
+    fetched = []
+    if to_verify:
+        with ThreadPoolExecutor(max_workers=min(workers, len(to_verify))) as pool:
+            fetched = list(pool.map(_fetch_transaction, to_verify))
+
+    settled = []
+    for reference, data, error in fetched:
+        payment = payments.get(reference)
+        if isinstance(error, paystack.PaystackUnavailable):
+            queue_verification(reference, voter_ip)
+            outcomes[reference] = _outcome(reference, "queued", "Verification queued until Paystack recovers.")
+            continue
+        try:
+            if error is not None:
+                raise error
+            paid_at = _check_transaction(data, payment)
+        except PaymentError as exc:
+            outcomes[reference] = _outcome(reference, "failed", exc.message)
+            continue
+        settled.append((reference, data, payment, paid_at))
+
+    with transaction.atomic():
+        claimed = []
+        for reference, data, payment, paid_at in settled:
+            try:
+                # A savepoint per reference, so a refused one does not leave
+                # the payment rebuilt from its metadata behind.
+                with transaction.atomic():
+                    if payment is None:
+                        payment = _payment_from_metadata(reference, data)
+                    params = _check_voting_open(payment.contestant_id, paid_at)
+                    _check_not_finalized(params.event_pk)
+                    if not Payment.objects.filter(pk=payment.pk, status='pending').update(status='success', paid_at=paid_at):
+                        raise PaymentError("Payment already verified.", 409)
+                _forget_initialization(payment)
+            except PaymentError as exc:
+                status = "already_verified" if exc.status_code == 409 else "failed"
+                outcomes[reference] = _outcome(reference, status, exc.message)
+                continue
+            claimed.append((reference, payment))
+
+        # bulk_create bypasses the per-vote post_save tally signal; tallies are
+        # applied below with one F() update per contestant instead.
+        votes = Vote.objects.bulk_create([
+            Vote(contestant_id=payment.contestant_id, voter_ip=voter_ip, quantity=payment.quantity)
+            for _, payment in claimed
+        ])
+        tallies = defaultdict(int)
+        voters = defaultdict(list)
+        for (reference, payment), vote in zip(claimed, votes):
+            payment.vote = vote
+            tallies[payment.contestant_id] += vote.quantity
+            voters[payment.contestant.event_id].append((voter_ip, payment.phone_number))
+            outcomes[reference] = _outcome(reference, "recorded", "Payment verified and vote recorded successfully.", vote={
+                "contestant": payment.contestant.contestant_name,
+                "quantity": vote.quantity,
+                "timestamp": vote.timestamp,
+            }, receipt=receipt_for(payment, vote))
+        Payment.objects.bulk_update([payment for _, payment in claimed], ['vote'])
+        for contestant_id, quantity in tallies.items():
+            Contestant.objects.filter(pk=contestant_id).update(vote_count=F('vote_count') + quantity)
+        event_pks = {payment.contestant.event_id for _, payment in claimed}
+        bump_versions_on_commit(event_pks, VOTES)
+        schedule_publish_on_commit(event_pks)
+        for event_pk, event_voters in voters.items():
+            record_votes_on_commit(event_pk, event_voters)
+
+    return [outcomes[reference] for reference in references]
+
+
+def queue_verification(reference, voter_ip):
+    QueuedVerification.objects.get_or_create(reference=reference, defaults={"voter_ip": voter_ip})
+
+
+# Works through verifications queued while Paystack was unavailable. Stops at
+# the first upstream failure so an open breaker is not hammered.
+def settle_queued_verifications(limit=100):
+    settled = failed = 0
+    for queued in QueuedVerification.objects.order_by('queued_at')[:limit]:
+        try:
+            verify_payment(queued.reference, queued.voter_ip)
+        except paystack.PaystackUnavailable as exc:
+            QueuedVerification.objects.filter(pk=queued.pk).update(
+                attempts=queued.attempts + 1, last_error=str(exc)[:255], last_attempt_at=timezone.now(),
+            )
+            break
+        except PaymentError:
+            failed += 1
+        else:
+            settled += 1
+        queued.delete()
+    return settled, failed
@@ -0,0 +1,183 @@
+import threading
+import time
+from collections import deque
+
+import requests
+from django.conf import settings
+
+from .metrics import observe_paystack, registry
+
+PAYSTACK_BASE_URL = "https://api.paystack.co"
+PAYSTACK_TIMEOUT = 10
+
+CIRCUIT_BREAKER_DEFAULTS = {
+    # Outcomes older than this are forgotten.
+    'WINDOW_SECONDS': 30,
+    # Do not judge the error rate on fewer calls than this.
+    'MIN_CALLS': 10,
+    # Trip when this share of calls in the window failed or was slow.
+    'FAILURE_RATE': 0.5,
+    # Calls slower than this count as failures even if they succeed.
+    'SLOW_CALL_SECONDS': 5,
+    # How long to fail fast before letting probe calls through.
+    'RESET_SECONDS': 30,
+    # Probe calls allowed while half-open.
+    'HALF_OPEN_CALLS': 1,
+}
+
+CLOSED, HALF_OPEN, OPEN = 'closed', 'half_open', 'open'
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class PaystackUnavailable(Exception):
+    pass
+
+
+class CircuitOpen(PaystackUnavailable):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._outcomes = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._publish_state()
+
+    def _config(self, key):
+        overrides = getattr(settings, 'PAYSTACK_CIRCUIT_BREAKER', {})
+        return overrides.get(key, CIRCUIT_BREAKER_DEFAULTS[key])
+
+    @property
+    def state(self):
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def allow(self):
+        now = time.monotonic()
+        with self._lock:
+            self._maybe_half_open(now)
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self._config('HALF_OPEN_CALLS'):
+                self._probes += 1
+                return True
+        registry.inc('evote_paystack_circuit_rejections_total', (('breaker', self.name),))
+        return False
+
+    def record(self, ok, duration):
+        now = time.monotonic()
+        failed = not ok or duration >= self._config('SLOW_CALL_SECONDS')
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN if failed else CLOSED, now)
+                return
+            self._outcomes.append((now, failed))
+            horizon = now - self._config('WINDOW_SECONDS')
+            while self._outcomes and self._outcomes[0][0] < horizon:
+                self._outcomes.popleft()
+            calls = len(self._outcomes)
+            if self._state == CLOSED and calls >= self._config('MIN_CALLS'):
+                failures = sum(1 for _, f in self._outcomes if f)
+                if failures / calls >= self._config('FAILURE_RATE'):
+                    self._transition(OPEN, now)
+
+    def reset(self):
+        with self._lock:
+            self._transition(CLOSED, time.monotonic())
+
+    def _maybe_half_open(self, now):
+        if self._state == OPEN and now - self._opened_at >= self._config('RESET_SECONDS'):
+            self._transition(HALF_OPEN, now)
+
+    def _transition(self, state, now):
+        if state == self._state:
+            return
+        self._state = state
+        self._probes = 0
+        if state == OPEN:
+            self._opened_at = now
+        if state == CLOSED:
+            self._outcomes.clear()
+        registry.inc('evote_paystack_circuit_transitions_total', (('breaker', self.name), ('to', state)))
+        self._publish_state()
+
+    def _publish_state(self):
+        registry.set_gauge('evote_paystack_circuit_state', (('breaker', self.name),), STATE_VALUES[self._state])
+
+
+registry.describe('evote_paystack_circuit_state', 'gauge', 'Paystack circuit breaker state: 0 closed, 1 half-open, 2 open.')
+registry.describe('evote_paystack_circuit_rejections_total', 'counter', 'Paystack calls refused by the open breaker.')
+registry.describe('evote_paystack_circuit_transitions_total', 'counter', 'Paystack circuit breaker state changes.')
+
+breaker = CircuitBreaker('paystack')
+
+
+def _headers():
+    return {
+        "Authorization": f"Bearer {settings.PAYSTACK_SECRET_KEY}",
+        "Content-Type": "application/json",
+    }
+
+
+CIRCUIT_OPEN_MESSAGE = "Payments are temporarily unavailable. Please try again shortly."
+
+
+def _reject(operation):
+    observe_paystack(operation, "circuit_open", 0.0)
+    raise CircuitOpen(CIRCUIT_OPEN_MESSAGE)
+
+
+# Lets callers fail fast before doing work of their own while the breaker is
+# open. Half-open is let through: the call itself decides who gets to probe.
+def ensure_available(operation):
+    if breaker.state == OPEN:
+        registry.inc('evote_paystack_circuit_rejections_total', (('breaker', breaker.name),))
+        _reject(operation)
+
+
+def _request(method, path, operation, **kwargs):
+    if not breaker.allow():
+        _reject(operation)
+
+    base_url = getattr(settings, "PAYSTACK_BASE_URL", PAYSTACK_BASE_URL).rstrip("/")
+    timeout = getattr(settings, "PAYSTACK_TIMEOUT", PAYSTACK_TIMEOUT)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        response = requests.request(method, f"{base_url}{path}", headers=_headers(), timeout=timeout, **kwargs)
+        outcome = str(response.status_code)
+        if response.status_code >= 500:
+            raise PaystackUnavailable("Paystack is failing; please try again shortly.")
+        return response
+    except requests.Timeout as exc:
+        outcome = "timeout"
+        raise PaystackUnavailable("Paystack did not respond in time.") from exc
+    except requests.RequestException as exc:
+        raise PaystackUnavailable("Could not reach Paystack.") from exc
+    finally:
+        duration = time.perf_counter() - start
+        # 4xx answers mean Paystack is up and rejecting the request, which is not a failure of the dependency.
+        breaker.record(outcome.isdigit() and int(outcome) < 500, duration)
+        observe_paystack(operation, outcome, duration)
+
+
+# Gateways in front of Paystack answer errors with HTML; an unreadable body is
+# treated like an outage rather than a verdict on the transaction.
+def read_json(response):
+    try:
+        return response.json()
+    except ValueError as exc:
+        raise PaystackUnavailable("Paystack returned an unreadable response.") from exc
+
+
+def initialize_transaction(data):
+    return _request("post", "/transaction/initialize", "initialize", json=data)
+
+
+def verify_transaction(reference):
+    return _request("get", f"/transaction/verify/{reference}", "verify")
@@ -0,0 +1,237 @@
+import hashlib
+import hmac
+import itertools
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import Request, urlopen
+
+
+class LatencyDistribution:
+    # Parsed from "fixed:<ms>", "uniform:<min_ms>:<max_ms>" or
+    # "lognormal:<median_ms>:<sigma>"; samples are returned in seconds.
+
+    def __init__(self, spec="fixed:0", rng=None):
+        self.spec = spec
+        self.rng = rng or random.Random()
+        kind, _, args = spec.partition(":")
+        values = [float(v) for v in args.split(":") if v]
+        if kind == "fixed" and len(values) == 1:
+            self._sample = lambda: values[0]
+        elif kind == "uniform" and len(values) == 2:
+            self._sample = lambda: self.rng.uniform(values[0], values[1])
+        elif kind == "lognormal" and len(values) == 2:
+            mu = math.log(values[0]) if values[0] > 0 else 0.0
+            self._sample = lambda: self.rng.lognormvariate(mu, values[1])
+        else:
+            raise ValueError(f"Invalid latency spec '{spec}'.")
+
+    def sample(self):
+        return max(0.0, self._sample()) / 1000
+
+
+# A local stand-in for api.paystack.co. It keeps transactions in memory and
+# answers the endpoints the payment views call, so payment flows can run
+# offline by pointing PAYSTACK_BASE_URL at it. Latency, upstream errors,
+# hanging requests, declined charges and webhook delivery are all injectable.
+class PaystackSimulator:
+    def __init__(self, host='127.0.0.1', port=0, secret_key=None, latency="fixed:0", error_rate=0.0,
+                 timeout_rate=0.0, timeout_seconds=30.0, decline_rate=0.0, webhook_url=None,
+                 webhook_delay=0.0, seed=None):
+        self.transactions = {}
+        self._ids = itertools.count(1)
+        self.secret_key = secret_key
+        self.rng = random.Random(seed)
+        self.latency = LatencyDistribution(latency, self.rng)
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_seconds = timeout_seconds
+        self.decline_rate = decline_rate
+        self.webhook_url = webhook_url
+        self.webhook_delay = webhook_delay
+        self.stats = {"requests": 0, "errors": 0, "timeouts": 0, "webhooks_sent": 0, "webhooks_failed": 0}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def _chance(self, rate):
+        with self._lock:
+            return rate > 0 and self.rng.random() < rate
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def add_transaction(self, reference, amount, metadata, status='success'):
+        transaction = {
+            "id": next(self._ids),
+            "reference": reference,
+            "amount": amount,
+            "status": status,
+            "gateway_response": "Approved" if status == "success" else "Declined",
+            "metadata": metadata,
+            "channel": "mobile_money",
+            "currency": "GHS",
+            "paid_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        }
+        with self._lock:
+            self.transactions[reference] = transaction
+        return transaction
+
+    def initialize(self, payload):
+        reference = payload.get("reference") or uuid.uuid4().hex[:16]
+        status = "failed" if self._chance(self.decline_rate) else "success"
+        transaction = self.add_transaction(reference, payload.get("amount", 0), payload.get("metadata", {}), status)
+        if self.webhook_url:
+            threading.Thread(target=self.deliver_webhook, args=(transaction,), daemon=True).start()
+        return {
+            "authorization_url": f"{self.base_url}/pay/{reference}",
+            "access_code": uuid.uuid4().hex[:15],
+            "reference": reference,
+        }
+
+    def verify(self, reference):
+        with self._lock:
+            return self.transactions.get(reference)
+
+    def list_transactions(self, status=None, page=1, per_page=50):
+        with self._lock:
+            transactions = list(self.transactions.values())
+        if status:
+            transactions = [t for t in transactions if t["status"] == status]
+        transactions.reverse()
+        start = (page - 1) * per_page
+        return transactions[start:start + per_page], {
+            "total": len(transactions),
+            "perPage": per_page,
+            "page": page,
+            "pageCount": max(1, math.ceil(len(transactions) / per_page)),
+        }
+
+    def sign(self, body):
+        return hmac.new((self.secret_key or "").encode(), body, hashlib.sha512).hexdigest()
+
+    def deliver_webhook(self, transaction):
+        time.sleep(self.webhook_delay)
+        event = "charge.success" if transaction["status"] == "success" else "charge.failed"
+        body = json.dumps({"event": event, "data": transaction}).encode()
+        request = Request(self.webhook_url, data=body, method="POST", headers={
+            "Content-Type": "application/json",
+            "x-paystack-signature": self.sign(body),
+        })
+        try:
+            with urlopen(request, timeout=10):
+                pass
+            self._count("webhooks_sent")
+        except OSError:
+            self._count("webhooks_failed")
+
+    def authorized(self, header):
+        if self.secret_key is None:
+            return True
+        return hmac.compare_digest(header or "", f"Bearer {self.secret_key}")
+
+
+def _handler_for(simulator):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if not length:
+                return {}
+            return json.loads(self.rfile.read(length))
+
+        # Applies injected latency and faults. Returns False when the request
+        # has already been answered (or deliberately left hanging).
+        def _simulate(self):
+            simulator._count("requests")
+            time.sleep(simulator.latency.sample())
+            if simulator._chance(simulator.timeout_rate):
+                simulator._count("timeouts")
+                time.sleep(simulator.timeout_seconds)
+                self.close_connection = True
+                return False
+            if simulator._chance(simulator.error_rate):
+                simulator._count("errors")
+                self._send(500, {"status": False, "message": "Simulated upstream error"})
+                return False
+            if not simulator.authorized(self.headers.get("Authorization")):
+                self._send(401, {"status": False, "message": "Invalid key"})
+                return False
+            return True
+
+        def do_POST(self):
+            if urlsplit(self.path).path.rstrip("/") != "/transaction/initialize":
+                return self._send(404, {"status": False, "message": "Not found"})
+            payload = self._read_json()
+            if not self._simulate():
+                return
+            data = simulator.initialize(payload)
+            self._send(200, {"status": True, "message": "Authorization URL created", "data": data})
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            prefix = "/transaction/verify/"
+            if url.path.startswith(prefix):
+                if not self._simulate():
+                    return
+                transaction = simulator.verify(url.path[len(prefix):])
+                if transaction is None:
+                    return self._send(400, {"status": False, "message": "Transaction reference not found"})
+                return self._send(200, {"status": True, "message": "Verification successful", "data": transaction})
+
+            if url.path.rstrip("/") == "/transaction":
+                if not self._simulate():
+                    return
+                query = parse_qs(url.query)
+                transactions, meta = simulator.list_transactions(
+                    status=query.get("status", [None])[0],
+                    page=int(query.get("page", [1])[0]),
+                    per_page=int(query.get("perPage", [50])[0]),
+                )
+                return self._send(200, {"status": True, "message": "Transactions retrieved",
+                                        "data": transactions, "meta": meta})
+
+            if url.path.rstrip("/") == "/_sim/stats":
+                return self._send(200, dict(simulator.stats, transactions=len(simulator.transactions)))
+
+            self._send(404, {"status": False, "message": "Not found"})
+
+    return Handler
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cards import contestant_card
+from .models import Contestant, Event
+from .renderers import ORJSONRenderer
+from .results import get_results
+from .serializers import EventSerializer
+
+STATIC_PUBLISH_DEBOUNCE_SECONDS = 2
+MANIFEST_NAME = 'manifest.json'
+
+
+def publish_root():
+    return Path(getattr(settings, 'STATIC_PUBLISH_ROOT', Path(settings.BASE_DIR) / 'public'))
+
+
+def publishing_enabled():
+    return getattr(settings, 'STATIC_PUBLISH_ENABLED', False)
+
+
+def event_directory(event_id):
+    return publish_root() / 'events' / str(event_id)
+
+
+def _write_atomic(path, body):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(body)
+    os.replace(tmp, path)
+
+
+# Snapshot files are named after their content, so they never change once
+# written and can be cached forever; only manifest.json points at new ones.
+def _write_snapshot(directory, name, data):
+    body = ORJSONRenderer().render(data)
+    filename = f"{name}.{hashlib.sha256(body).hexdigest()[:16]}.json"
+    if not (directory / filename).exists():
+        _write_atomic(directory / filename, body)
+    return filename
+
+
+def _read_manifest(directory):
+    try:
+        return json.loads((directory / MANIFEST_NAME).read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+# Writes the public view of one event (details, contestant cards, standings)
+# and its manifest. Returns the manifest, or None if the event was taken down.
+def publish_event(event_pk):
+    event = (
+        Event.all_objects.select_related('organizer').prefetch_related('contestants')
+        .filter(pk=event_pk).first()
+    )
+    if event is None:
+        return None
+    if event.deleted_at is not None:
+        unpublish_event(event.event_id)
+        return None
+
+    directory = event_directory(event.event_id)
+    directory.mkdir(parents=True, exist_ok=True)
+    contestants = Contestant.objects.filter(event=event).select_related('event').order_by('pk')
+    standings, finalized = get_results(event)
+    files = {
+        "event": _write_snapshot(directory, 'event', EventSerializer(event).data),
+        "contestants": _write_snapshot(directory, 'contestants', [contestant_card(c) for c in contestants]),
+        "standings": _write_snapshot(directory, 'standings', {"finalized": finalized, "results": standings}),
+    }
+
+    previous = _read_manifest(directory)
+    if previous is not None and previous.get("files") == files:
+        return previous
+    manifest = {"event_id": str(event.event_id), "published_at": timezone.now().isoformat(), "files": files}
+    _write_atomic(directory / MANIFEST_NAME, json.dumps(manifest).encode())
+
+    # Keep the previous generation for clients still holding the old manifest.
+    keep = set(files.values()) | set((previous or {}).get("files", {}).values()) | {MANIFEST_NAME}
+    for path in directory.glob('*.json'):
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+    return manifest
+
+
+def unpublish_event(event_id):
+    shutil.rmtree(event_directory(event_id), ignore_errors=True)
+
+
+# Changes are collected per process and published together once the debounce
+# window closes. The window starts at the first change, so a steady stream of
+# votes republishes an event every few seconds rather than never.
+_lock = threading.Lock()
+_pending = set()
+_timer = None
+
+
+def _flush():
+    global _timer
+    with _lock:
+        event_pks = sorted(_pending)
+        _pending.clear()
+        _timer = None
+    try:
+        for event_pk in event_pks:
+            publish_event(event_pk)
+    finally:
+        connection.close()
+
+
+def schedule_publish(event_pks):
+    global _timer
+    if not publishing_enabled():
+        return
+    with _lock:
+        _pending.update(event_pks)
+        if _timer is None:
+            _timer = threading.Timer(
+                getattr(settings, 'STATIC_PUBLISH_DEBOUNCE_SECONDS', STATIC_PUBLISH_DEBOUNCE_SECONDS), _flush
+            )
+            _timer.daemon = True
+            _timer.start()
+
+
+def schedule_publish_on_commit(event_pks):
+    event_pks = set(event_pks)
+    transaction.on_commit(lambda: schedule_publish(event_pks))
+
+
+def unpublish_on_commit(event_id):
+    if publishing_enabled():
+        transaction.on_commit(lambda: unpublish_event(event_id))
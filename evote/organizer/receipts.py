@@ -0,0 +1,39 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+
+RECEIPT_SALT = 'evote.receipt'
+
+
+class InvalidReceipt(Exception):
+    pass
+
+
+def _key():
+    # None makes Django sign with SECRET_KEY and accept SECRET_KEY_FALLBACKS.
+    return getattr(settings, 'RECEIPT_SIGNING_KEY', None) or None
+
+
+# A receipt is the vote itself, signed: anyone holding it can prove the vote
+# was recorded, and checking it needs only the signing key, not the database.
+def sign_receipt(reference, contestant_id, quantity, voted_at):
+    payload = {"r": reference, "c": contestant_id, "q": quantity, "t": int(voted_at.timestamp())}
+    return signing.dumps(payload, key=_key(), salt=RECEIPT_SALT, compress=True)
+
+
+def receipt_for(payment, vote):
+    return sign_receipt(payment.reference, payment.contestant_id, vote.quantity, vote.timestamp)
+
+
+def check_receipt(token):
+    try:
+        payload = signing.loads(token, key=_key(), salt=RECEIPT_SALT)
+    except signing.BadSignature:
+        raise InvalidReceipt("Invalid receipt.")
+    return {
+        "reference": payload["r"],
+        "contestant_id": payload["c"],
+        "quantity": payload["q"],
+        "voted_at": datetime.fromtimestamp(payload["t"], tz=dt_timezone.utc).isoformat(),
+    }
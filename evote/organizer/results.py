@@ -0,0 +1,123 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from .caching import caches_bypassed
+from .models import Contestant, EventResult
+
+# Final results never change, so they can stay cached for as long as the backend keeps them.
+RESULTS_CACHE_KEY = "evote:public-results:{event_id}"
+CENTS = Decimal('0.01')
+# Payments made inside the voting window can still be verified after it closes
+# (slow confirmations, verifications queued while Paystack was down), so
+# results are only snapshotted this long after end_date.
+RESULTS_FINALIZE_GRACE_SECONDS = 3600
+
+
+def finalize_after(event):
+    grace = getattr(settings, 'RESULTS_FINALIZE_GRACE_SECONDS', RESULTS_FINALIZE_GRACE_SECONDS)
+    return event.end_date + timedelta(seconds=grace)
+
+
+def compute_standings(event):
+    contestants = (
+        Contestant.objects.filter(event=event)
+        .annotate(
+            total_votes=Sum('votes__quantity'),
+            total_revenue=Sum('votes__payment__amount', filter=Q(votes__payment__status='success')),
+        )
+        .order_by('-total_votes', 'contestant_name')
+        .values('id', 'contestant_name', 'photo_url', 'total_votes', 'total_revenue')
+    )
+
+    standings = []
+    total_votes = 0
+    total_revenue = Decimal('0')
+    previous_votes, rank = None, 0
+    for position, row in enumerate(contestants, start=1):
+        votes = row['total_votes'] or 0
+        revenue = Decimal(row['total_revenue'] or 0)
+        # Standard competition ranking: ties share a rank and the next rank is skipped.
+        if votes != previous_votes:
+            rank, previous_votes = position, votes
+        standings.append({
+            "rank": rank,
+            "contestant_id": row['id'],
+            "contestant_name": row['contestant_name'],
+            "photo_url": row['photo_url'],
+            "votes": votes,
+            "revenue": str(revenue.quantize(CENTS)),
+        })
+        total_votes += votes
+        total_revenue += revenue
+
+    return {
+        "event": {
+            "event_id": str(event.event_id),
+            "event_name": event.event_name,
+            "start_date": event.start_date.isoformat(),
+            "end_date": event.end_date.isoformat(),
+        },
+        "total_votes": total_votes,
+        "total_revenue": str(total_revenue.quantize(CENTS)),
+        "standings": standings,
+    }
+
+
+# Revenue stays in the EventResult snapshot for the organizer's dashboard;
+# results served to anyone and published to disk carry votes and ranks only.
+def public_results(payload):
+    public = {key: value for key, value in payload.items() if key != "total_revenue"}
+    public["standings"] = [
+        {key: value for key, value in row.items() if key != "revenue"} for row in payload["standings"]
+    ]
+    return public
+
+
+def finalize_event(event):
+    existing = EventResult.objects.filter(event=event).first()
+    if existing is not None:
+        return existing
+
+    payload = compute_standings(event)
+    payload["finalized_at"] = timezone.now().isoformat()
+    try:
+        with transaction.atomic():
+            return EventResult.objects.create(
+                event=event,
+                total_votes=payload["total_votes"],
+                total_revenue=Decimal(payload["total_revenue"]),
+                payload=payload,
+            )
+    except IntegrityError:
+        # Another request finalized the event first; theirs is just as final.
+        return EventResult.objects.get(event=event)
+
+
+def get_final_results(event_id):
+    key = RESULTS_CACHE_KEY.format(event_id=event_id)
+    payload = cache.get(key)
+    if payload is None:
+        payload = EventResult.objects.filter(event__event_id=event_id, event__deleted_at__isnull=True).values_list('payload', flat=True).first()
+        if payload is not None:
+            payload = public_results(payload)
+            if not caches_bypassed():
+                cache.set(key, payload, None)
+    return payload
+
+
+def get_results(event):
+    if finalize_after(event) > timezone.now():
+        return public_results(compute_standings(event)), False
+
+    payload = get_final_results(event.event_id)
+    if payload is None:
+        payload = public_results(finalize_event(event).payload)
+        if not caches_bypassed():
+            cache.set(RESULTS_CACHE_KEY.format(event_id=event.event_id), payload, None)
+    return payload, True
@@ -0,0 +1,113 @@
+import re
+
+from django.db import connection
+
+from .models import Contestant, Event
+
+MAX_TERMS = 8
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+_fts5_available = None
+
+
+def _terms(query):
+    return _TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def _has_fts5():
+    global _fts5_available
+    if _fts5_available is None:
+        _fts5_available = 'organizer_search' in connection.introspection.table_names()
+    return _fts5_available
+
+
+def _sqlite_search(terms, kind, limit):
+    # Every term is a quoted prefix query, so "ama ser" matches "Amanda Serwaa".
+    match = " ".join(f'"{term}"*' for term in terms)
+    parity = {'contestant': " AND rowid % 2 = 0", 'event': " AND rowid % 2 = 1"}.get(kind, "")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT rowid FROM organizer_search WHERE organizer_search MATCH %s" + parity +
+            " ORDER BY bm25(organizer_search, 10.0, 1.0) LIMIT %s",
+            [match, limit],
+        )
+        rowids = [row[0] for row in cursor.fetchall()]
+    return [('contestant' if rowid % 2 == 0 else 'event', rowid // 2) for rowid in rowids]
+
+
+def _postgres_search(terms, kind, limit):
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    selects = []
+    if kind in (None, 'contestant'):
+        selects.append(
+            "SELECT 'contestant', id, ts_rank(to_tsvector('simple', contestant_name || ' ' || coalesce(bio, '')), q) "
+            "FROM organizer_contestant, to_tsquery('simple', %s) q "
+            "WHERE to_tsvector('simple', contestant_name || ' ' || coalesce(bio, '')) @@ q"
+        )
+    if kind in (None, 'event'):
+        selects.append(
+            "SELECT 'event', id, ts_rank(to_tsvector('simple', event_name), q) "
+            "FROM organizer_event, to_tsquery('simple', %s) q "
+            "WHERE to_tsvector('simple', event_name) @@ q"
+        )
+    sql = " UNION ALL ".join(selects) + " ORDER BY 3 DESC LIMIT %s"
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [tsquery] * len(selects) + [limit])
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+
+def _fallback_search(terms, kind, limit):
+    hits = []
+    if kind in (None, 'contestant'):
+        queryset = Contestant.objects.filter(event__deleted_at__isnull=True)
+        for term in terms:
+            queryset = queryset.filter(contestant_name__icontains=term)
+        hits += [('contestant', pk) for pk in queryset.values_list('pk', flat=True)[:limit]]
+    if kind in (None, 'event'):
+        queryset = Event.objects.all()
+        for term in terms:
+            queryset = queryset.filter(event_name__icontains=term)
+        hits += [('event', pk) for pk in queryset.values_list('pk', flat=True)[:limit]]
+    return hits[:limit]
+
+
+def search(query, kind=None, limit=20):
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    if connection.vendor == 'postgresql':
+        hits = _postgres_search(terms, kind, limit)
+    elif connection.vendor == 'sqlite' and _has_fts5():
+        hits = _sqlite_search(terms, kind, limit)
+    else:
+        hits = _fallback_search(terms, kind, limit)
+
+    contestant_ids = [pk for hit_kind, pk in hits if hit_kind == 'contestant']
+    event_ids = [pk for hit_kind, pk in hits if hit_kind == 'event']
+    contestants = (
+        Contestant.objects.filter(event__deleted_at__isnull=True).select_related('event').in_bulk(contestant_ids)
+        if contestant_ids else {}
+    )
+    events = Event.objects.in_bulk(event_ids) if event_ids else {}
+
+    results = []
+    for hit_kind, pk in hits:
+        if hit_kind == 'contestant' and pk in contestants:
+            contestant = contestants[pk]
+            results.append({
+                "type": "contestant",
+                "id": contestant.pk,
+                "name": contestant.contestant_name,
+                "photo_url": contestant.photo_url,
+                "event_id": contestant.event.event_id,
+                "event_name": contestant.event.event_name,
+            })
+        elif hit_kind == 'event' and pk in events:
+            event = events[pk]
+            results.append({
+                "type": "event",
+                "event_id": event.event_id,
+                "name": event.event_name,
+                "logo_url": event.logo_url,
+            })
+    return results
@@ -1,10 +1,26 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 from .models import Event
 from .models import Contestant
 from .models import Vote
+from .models import SUPPORTED_PROVIDERS
+
+PAYMENT_BATCH_VERIFY_LIMIT = 50
+ORGANIZER_BATCH_LIMIT = 50
+
+
+class EventIdField(serializers.SlugRelatedField):
+    # event_id is a UUIDField; a malformed value fails in the ORM with Django's
+    # ValidationError, which SlugRelatedField does not catch on its own.
+    def to_internal_value(self, data):
+        try:
+            return super().to_internal_value(data)
+        except DjangoValidationError:
+            self.fail('invalid')
+
 
 class ContestantSerializer(serializers.ModelSerializer):
-    event = serializers.SlugRelatedField(
+    event = EventIdField(
         queryset=Event.objects.all(),
         slug_field='event_id'  # match the field you're submitting
     )
@@ -37,6 +53,28 @@ class EventSerializer(serializers.ModelSerializer):
 
 
 
+class TrendingEventSerializer(serializers.ModelSerializer):
+    organizer = serializers.ReadOnlyField(source='organizer.username')
+    score = serializers.FloatField(read_only=True)
+    recent_votes = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Event
+        fields = [
+            'event_id',
+            'organizer',
+            'event_name',
+            'logo_url',
+            'start_date',
+            'end_date',
+            'vote_type',
+            'price_per_vote',
+            'score',
+            'recent_votes',
+        ]
+
+
+
 class VoteSerializer(serializers.ModelSerializer):
     total_amount = serializers.SerializerMethodField()
 
@@ -55,7 +93,29 @@ class PaystackInitRequestSerializer(serializers.Serializer):
     phone_number = serializers.CharField()
     contestant_id = serializers.IntegerField()
     quantity = serializers.IntegerField(min_value=1)
-    provider = serializers.ChoiceField(choices=["mtn", "vodafone", "airteltigo"])
+    provider = serializers.ChoiceField(choices=SUPPORTED_PROVIDERS)
 
 class PaystackVerifyRequestSerializer(serializers.Serializer):
     reference = serializers.CharField()
+
+class PaystackBatchVerifyRequestSerializer(serializers.Serializer):
+    references = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        min_length=1,
+        max_length=PAYMENT_BATCH_VERIFY_LIMIT,
+    )
+
+
+class BatchSubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'])
+    path = serializers.CharField(max_length=500)
+    body = serializers.JSONField(required=False, allow_null=True)
+
+
+class OrganizerBatchRequestSerializer(serializers.Serializer):
+    requests = serializers.ListField(
+        child=BatchSubRequestSerializer(),
+        min_length=1,
+        max_length=ORGANIZER_BATCH_LIMIT,
+    )
+    atomic = serializers.BooleanField(default=False)
@@ -1,12 +1,92 @@
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import Vote
+from .models import Event, Contestant, Vote
+from .caching import META, VOTES, bump_versions_on_commit
+from . import voting
+from .publishing import schedule_publish_on_commit, unpublish_on_commit
 
 # This signal will be triggered after a Vote instance is saved
 
 @receiver(post_save, sender=Vote)
 def increment_vote_count(sender, instance, created, **kwargs):
     if created:
-        instance.contestant.vote_count += instance.quantity
-        instance.contestant.save()
+        # Incremented in the database: the contestant loaded with the payment
+        # may be stale, and saving it would drop concurrent votes.
+        Contestant.objects.filter(pk=instance.contestant_id).update(vote_count=F('vote_count') + instance.quantity)
 
+
+
+# Cached event data is keyed by per-event version numbers (see caching.py).
+
+@receiver(post_save, sender=Event)
+def bump_event_cache(sender, instance, **kwargs):
+    bump_versions_on_commit([instance.pk], META)
+
+
+@receiver(post_save, sender=Contestant)
+def bump_contestant_cache(sender, instance, update_fields=None, **kwargs):
+    # Tallies belong to the votes scope, which vote saves and tally updates bump themselves.
+    if update_fields is not None and set(update_fields) == {'vote_count'}:
+        return
+    bump_versions_on_commit([instance.event_id], META)
+
+
+@receiver(post_save, sender=Vote)
+def bump_vote_cache(sender, instance, **kwargs):
+    bump_versions_on_commit([instance.contestant.event_id], VOTES)
+
+
+# Votes have no delete receivers so that cascades can fast-delete them; the
+# event or contestant being deleted bumps the votes scope on their behalf.
+@receiver(post_delete, sender=Event)
+def bump_deleted_event_cache(sender, instance, **kwargs):
+    bump_versions_on_commit([instance.pk], META)
+    bump_versions_on_commit([instance.pk], VOTES)
+
+
+@receiver(post_delete, sender=Contestant)
+def bump_deleted_contestant_cache(sender, instance, **kwargs):
+    bump_versions_on_commit([instance.event_id], META)
+    bump_versions_on_commit([instance.event_id], VOTES)
+
+
+
+# Payment views read voting windows and prices from voting.py's in-process cache.
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_voting_params(sender, instance, **kwargs):
+    voting.invalidate_event(instance.pk)
+
+
+@receiver(post_save, sender=Contestant)
+@receiver(post_delete, sender=Contestant)
+def invalidate_contestant_voting_params(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'vote_count'}:
+        return
+    voting.invalidate_contestant(instance.pk)
+
+
+
+# Public JSON snapshots (see publishing.py) are rebuilt shortly after a change.
+
+@receiver(post_save, sender=Event)
+def publish_event_snapshot(sender, instance, **kwargs):
+    schedule_publish_on_commit([instance.pk])
+
+
+@receiver(post_delete, sender=Event)
+def unpublish_event_snapshot(sender, instance, **kwargs):
+    unpublish_on_commit(instance.event_id)
+
+
+@receiver(post_save, sender=Contestant)
+@receiver(post_delete, sender=Contestant)
+def publish_contestant_snapshot(sender, instance, **kwargs):
+    schedule_publish_on_commit([instance.event_id])
+
+
+@receiver(post_save, sender=Vote)
+def publish_vote_snapshot(sender, instance, **kwargs):
+    schedule_publish_on_commit([instance.contestant.event_id])
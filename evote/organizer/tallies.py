@@ -0,0 +1,55 @@
+from django.db.models import F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .caching import VOTES, bump_versions_on_commit
+from .models import Contestant, Vote
+
+
+def _true_total():
+    return Coalesce(
+        Subquery(
+            Vote.objects.filter(contestant=OuterRef('pk'))
+            .values('contestant')
+            .annotate(total=Sum('quantity'))
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def find_drift(event=None):
+    # One grouped aggregate; HAVING keeps only contestants whose stored tally disagrees.
+    # Archived events have no votes left in the hot table to count against.
+    contestants = Contestant.objects.filter(event__archive__isnull=True, event__deleted_at__isnull=True)
+    if event is not None:
+        contestants = contestants.filter(event=event)
+    rows = (
+        contestants
+        .annotate(actual=Coalesce(Sum('votes__quantity'), Value(0)))
+        .exclude(vote_count=F('actual'))
+        .values('id', 'contestant_name', 'event__event_id', 'vote_count', 'actual')
+        .order_by('id')
+    )
+    return [
+        {
+            "contestant_id": row['id'],
+            "contestant_name": row['contestant_name'],
+            "event_id": row['event__event_id'],
+            "vote_count": row['vote_count'],
+            "actual": row['actual'],
+            "drift": row['vote_count'] - row['actual'],
+        }
+        for row in rows
+    ]
+
+
+def fix_drift(drift):
+    # The correct total is recomputed inside the UPDATE itself, so votes that
+    # land between the audit and the fix are not lost.
+    ids = [row["contestant_id"] for row in drift]
+    if not ids:
+        return 0
+    fixed = Contestant.objects.filter(pk__in=ids).update(vote_count=_true_total())
+    bump_versions_on_commit(Contestant.objects.filter(pk__in=ids).values_list('event_id', flat=True).distinct(), VOTES)
+    return fixed
@@ -1,3 +1,232 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from . import paystack
+from .caching import META, VOTES, bump_event_versions, get_event_cached
+from .fraud import SlidingCountMinSketch
+from .models import Contestant, Event, Payment, QueuedVerification
+from .receipts import InvalidReceipt, check_receipt, sign_receipt
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE, EVENT_CACHE_ENABLED=True)
+class OrganizerBatchRollbackTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.organizer = CustomUser.objects.create_user("organizer@example.com", "organizer", password=None)
+        self.event = Event.objects.create(
+            organizer=self.organizer, event_name="Finals", vote_type='paid', price_per_vote=Decimal('1.00'),
+            start_date=now - timedelta(hours=1), end_date=now + timedelta(days=1),
+        )
+        self.contestant = Contestant.objects.create(event=self.event, contestant_name="Ama")
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+
+    def test_rolled_back_batch_leaves_no_cached_reads(self):
+        card_path = f"/api/organizer/votes/{self.contestant.pk}/"
+        detail_path = f"/api/organizer/events/{self.event.event_id}/"
+        response = self.client.post("/api/organizer/batch/", {
+            "atomic": True,
+            "requests": [
+                {"method": "PATCH", "path": f"/api/organizer/contestants/{self.contestant.pk}/manage/",
+                 "body": {"contestant_name": "Ghost"}},
+                {"method": "GET", "path": card_path},
+                {"method": "GET", "path": detail_path},
+                {"method": "GET", "path": "/api/organizer/events/00000000-0000-0000-0000-000000000000/"},
+            ],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["failed_index"], 3)
+        self.assertEqual(response.data["results"][1]["body"]["contestant"]["name"], "Ghost")
+        self.contestant.refresh_from_db()
+        self.assertEqual(self.contestant.contestant_name, "Ama")
+
+        public = APIClient()
+        self.assertNotIn("Ghost", public.get(card_path).content.decode())
+        self.assertNotIn("Ghost", public.get(detail_path).content.decode())
+
+
+BREAKER_SETTINGS = {'MIN_CALLS': 4, 'FAILURE_RATE': 0.5, 'RESET_SECONDS': 30, 'HALF_OPEN_CALLS': 1}
+
+
+@override_settings(PAYSTACK_CIRCUIT_BREAKER=BREAKER_SETTINGS)
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('organizer.paystack.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = paystack.CircuitBreaker('test')
+
+    def trip(self):
+        for ok in (True, False, False, True):
+            self.breaker.record(ok, 0.1)
+
+    def test_stays_closed_below_min_calls(self):
+        for _ in range(3):
+            self.breaker.record(False, 0.1)
+        self.assertEqual(self.breaker.state, paystack.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_opens_at_failure_rate_and_fails_fast(self):
+        self.trip()
+        self.assertEqual(self.breaker.state, paystack.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_slow_successes_count_as_failures(self):
+        for _ in range(4):
+            self.breaker.record(True, 60)
+        self.assertEqual(self.breaker.state, paystack.OPEN)
+
+    def test_half_open_lets_one_probe_through(self):
+        self.trip()
+        self.now += 30
+        self.assertEqual(self.breaker.state, paystack.HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_successful_probe_closes(self):
+        self.trip()
+        self.now += 30
+        self.breaker.allow()
+        self.breaker.record(True, 0.1)
+        self.assertEqual(self.breaker.state, paystack.CLOSED)
+
+    def test_failed_probe_reopens(self):
+        self.trip()
+        self.now += 30
+        self.breaker.allow()
+        self.breaker.record(False, 0.1)
+        self.assertEqual(self.breaker.state, paystack.OPEN)
+        self.now += 29
+        self.assertFalse(self.breaker.allow())
+
+
+def _paystack_response(status_code, body):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    return response
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class PaystackOutageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(paystack.breaker.reset)
+        now = timezone.now()
+        organizer = CustomUser.objects.create_user("organizer@example.com", "organizer", password=None)
+        event = Event.objects.create(
+            organizer=organizer, event_name="Finals", vote_type='paid', price_per_vote=Decimal('1.00'),
+            start_date=now - timedelta(hours=1), end_date=now + timedelta(days=1),
+        )
+        self.contestant = Contestant.objects.create(event=event, contestant_name="Ama")
+        self.client = APIClient()
+
+    def init_payment(self):
+        return self.client.post("/api/organizer/payments/init/", {
+            "phone_number": "0241234567", "contestant_id": self.contestant.pk, "provider": "mtn", "quantity": 2,
+        }, format='json')
+
+    def test_open_breaker_refuses_init_without_writing_a_payment(self):
+        paystack.breaker._transition(paystack.OPEN, paystack.time.monotonic())
+        with mock.patch('organizer.paystack.requests.request') as request:
+            response = self.init_payment()
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+        request.assert_not_called()
+        self.assertFalse(Payment.objects.exists())
+
+    def test_paystack_5xx_on_init_answers_503(self):
+        with mock.patch('organizer.paystack.requests.request', return_value=_paystack_response(502, b"<html></html>")):
+            response = self.init_payment()
+        self.assertEqual(response.status_code, 503)
+
+    def test_paystack_5xx_on_verify_queues_the_reference(self):
+        with mock.patch('organizer.paystack.requests.request', return_value=_paystack_response(502, b"<html></html>")):
+            response = self.client.post("/api/organizer/payments/verify/", {"reference": "ref-1"}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(QueuedVerification.objects.filter(reference="ref-1").exists())
+
+
+@override_settings(CACHES=LOCMEM_CACHE, EVENT_CACHE_ENABLED=True)
+class EventCacheVersionTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.computed = 0
+
+    def compute(self):
+        self.computed += 1
+        return {"computed": self.computed}
+
+    def test_hit_until_the_version_is_bumped(self):
+        self.assertEqual(get_event_cached(1, 'detail', self.compute), {"computed": 1})
+        self.assertEqual(get_event_cached(1, 'detail', self.compute), {"computed": 1})
+        bump_event_versions([1], META)
+        self.assertEqual(get_event_cached(1, 'detail', self.compute), {"computed": 2})
+
+    def test_scopes_are_independent(self):
+        get_event_cached(1, 'card', self.compute, scopes=(META,))
+        bump_event_versions([1], VOTES)
+        self.assertEqual(get_event_cached(1, 'card', self.compute, scopes=(META,)), {"computed": 1})
+
+    def test_events_do_not_share_versions(self):
+        get_event_cached(1, 'detail', self.compute)
+        get_event_cached(2, 'detail', self.compute)
+        bump_event_versions([2], META)
+        self.assertEqual(get_event_cached(1, 'detail', self.compute), {"computed": 1})
+
+
+class ReceiptTests(SimpleTestCase):
+    def test_round_trip(self):
+        voted_at = timezone.now().replace(microsecond=0)
+        receipt = check_receipt(sign_receipt("ref-1", 7, 3, voted_at))
+        self.assertEqual(receipt["reference"], "ref-1")
+        self.assertEqual(receipt["contestant_id"], 7)
+        self.assertEqual(receipt["quantity"], 3)
+        self.assertEqual(receipt["voted_at"], voted_at.isoformat())
+
+    def test_tampered_receipt_is_rejected(self):
+        token = sign_receipt("ref-1", 7, 3, timezone.now())
+        with self.assertRaises(InvalidReceipt):
+            check_receipt(token[:-1] + ('A' if token[-1] != 'A' else 'B'))
+
+    def test_receipt_from_another_key_is_rejected(self):
+        with override_settings(RECEIPT_SIGNING_KEY='another-key'):
+            token = sign_receipt("ref-1", 7, 3, timezone.now())
+        with self.assertRaises(InvalidReceipt):
+            check_receipt(token)
+
+
+class SlidingCountMinSketchTests(SimpleTestCase):
+    def setUp(self):
+        self.sketch = SlidingCountMinSketch(width=64, depth=4, buckets=5, bucket_seconds=60)
+        self.sketch.advance(0)
+
+    def test_counts_within_the_window(self):
+        for _ in range(10):
+            self.sketch.add("203.0.113.9")
+        self.sketch.advance(120)
+        self.assertEqual(self.sketch.add("203.0.113.9"), 11)
+        self.assertGreaterEqual(self.sketch.estimate("203.0.113.9"), 11)
+
+    def test_old_buckets_fall_out_of_the_window(self):
+        for _ in range(10):
+            self.sketch.add("203.0.113.9")
+        self.sketch.advance(180)
+        self.sketch.add("203.0.113.9")
+        self.sketch.advance(300)
+        self.assertEqual(self.sketch.estimate("203.0.113.9"), 1)
+        self.sketch.advance(10_000)
+        self.assertEqual(self.sketch.estimate("203.0.113.9"), 0)
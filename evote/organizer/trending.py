@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from .models import Event, EventTrendingScore, Vote
+
+# (window, weight) pairs. Votes in the last 15 minutes count for the most, so
+# events that are hot right now outrank events that were busy hours ago.
+VELOCITY_WINDOWS = (
+    (timedelta(minutes=15), 4.0),
+    (timedelta(hours=1), 2.0),
+    (timedelta(hours=6), 1.0),
+)
+
+
+def compute_trending_scores(now=None):
+    now = now or timezone.now()
+    active = Event.objects.filter(start_date__lte=now, end_date__gte=now)
+    oldest = now - max(window for window, _ in VELOCITY_WINDOWS)
+
+    # One grouped, conditional aggregate over recent votes of active events only.
+    aggregates = {
+        f"w{i}": Sum('quantity', filter=Q(timestamp__gte=now - window))
+        for i, (window, _) in enumerate(VELOCITY_WINDOWS)
+    }
+    rows = (
+        Vote.objects.filter(timestamp__gte=oldest, contestant__event__in=active)
+        .values('contestant__event')
+        .annotate(**aggregates)
+    )
+    by_event = {row['contestant__event']: row for row in rows}
+
+    scores = []
+    for event_pk in active.values_list('pk', flat=True):
+        row = by_event.get(event_pk, {})
+        score = 0.0
+        for i, (window, weight) in enumerate(VELOCITY_WINDOWS):
+            per_hour = (row.get(f"w{i}") or 0) / (window.total_seconds() / 3600)
+            score += weight * per_hour
+        scores.append(EventTrendingScore(
+            event_id=event_pk,
+            score=round(score, 4),
+            recent_votes=row.get("w1") or 0,
+            computed_at=now,
+        ))
+
+    with transaction.atomic():
+        EventTrendingScore.objects.all().delete()
+        EventTrendingScore.objects.bulk_create(scores)
+    return len(scores)
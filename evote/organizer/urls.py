@@ -1,19 +1,33 @@
 from django.urls import path
 from .views import (EventCreateView, EventListView,EventDetailView,VoteCreateView,
                     ContestantCreateView, ContestantListView,EventUpdateDeleteView,
-                    ContestantUpdateDeleteView, PaystackInitPaymentView, PaystackVerifyPaymentView)
+                    ContestantUpdateDeleteView, PaystackInitPaymentView, PaystackVerifyPaymentView,
+                    EventResultsView, TrendingEventListView, SearchView, ContestantBatchView,
+                    PaystackBatchVerifyPaymentView, EventVoteAuditView,
+                    EventDashboardView, ReceiptCheckView, OrganizerBatchView)
 
 urlpatterns = [
     path('events/create/', EventCreateView.as_view(), name='event-create'),
     path('events/', EventListView.as_view(), name='event-list'),
-    path('events/<str:event_id>/', EventDetailView.as_view(), name='event-detail'),
-     path('events/<str:event_id>/manage/', EventUpdateDeleteView.as_view(), name='event-manage'),
-    path('contestants/<str:event_id>/manage/', ContestantUpdateDeleteView.as_view(), name='contestant-manage'),
+    path('events/trending/', TrendingEventListView.as_view(), name='event-trending'),
+    path('events/<uuid:event_id>/', EventDetailView.as_view(), name='event-detail'),
+    path('events/<uuid:event_id>/results/', EventResultsView.as_view(), name='event-results'),
+    path('events/<uuid:event_id>/dashboard/', EventDashboardView.as_view(), name='event-dashboard'),
+    path('events/<uuid:event_id>/audit/votes/', EventVoteAuditView.as_view(), name='event-vote-audit'),
+     path('events/<uuid:event_id>/manage/', EventUpdateDeleteView.as_view(), name='event-manage'),
+    path('contestants/<int:pk>/manage/', ContestantUpdateDeleteView.as_view(), name='contestant-manage'),
 
     path('contestants/create/', ContestantCreateView.as_view(), name='contestant-create'),
-    path('contestants/<str:event_id>/', ContestantListView.as_view(), name='contestant-list'),
+    path('contestants/batch/', ContestantBatchView.as_view(), name='contestant-batch'),
+    path('contestants/<int:event_id>/', ContestantListView.as_view(), name='contestant-list'),
+
+    path('votes/<int:contestant_id>/', VoteCreateView.as_view(), name='vote-contestant'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('batch/', OrganizerBatchView.as_view(), name='organizer-batch'),
 
     path('payments/init/', PaystackInitPaymentView.as_view(), name='paystack-init'),
     path('payments/verify/', PaystackVerifyPaymentView.as_view(), name='paystack-verify'),
+    path('payments/verify/batch/', PaystackBatchVerifyPaymentView.as_view(), name='paystack-verify-batch'),
+    path('payments/receipts/check/', ReceiptCheckView.as_view(), name='receipt-check'),
 ]
 
@@ -1,21 +1,43 @@
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView,RetrieveUpdateDestroyAPIView
 from .models import Event
 from .serializers import EventSerializer
-from drf_yasg.utils import swagger_auto_schema
+from utils.apidocs import openapi, swagger_auto_schema
 from rest_framework.permissions import IsAuthenticated,AllowAny
 from .models import Contestant
-from .serializers import ContestantSerializer,VoteSerializer
+from .serializers import ContestantSerializer
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.exceptions import PermissionDenied
-from .models import Contestant, Vote
-import requests
 from django.conf import settings
 from rest_framework.views import APIView
-from drf_yasg import openapi
-from .models import Payment
-from datetime import datetime
-from .serializers import PaystackVerifyRequestSerializer
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+import hmac
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404, HttpResponse
+from rest_framework.permissions import BasePermission
+from .metrics import registry
+from .results import get_final_results, get_results
+from .search import search
+from .tallies import find_drift, fix_drift
+from .deletion import soft_delete_event
+from .receipts import InvalidReceipt, check_receipt, receipt_for
+from .dashboard import get_dashboard
+from .batching import run_batch
+from .cards import get_contestant_cards
+from .caching import event_exists, event_pk_for, get_event_cached
+from .serializers import PaystackVerifyRequestSerializer, TrendingEventSerializer
+from .serializers import PaystackBatchVerifyRequestSerializer, PAYMENT_BATCH_VERIFY_LIMIT
+from .serializers import OrganizerBatchRequestSerializer, ORGANIZER_BATCH_LIMIT
+from . import paystack
+from .payments import PaymentError, initialize_payment, queue_verification, verify_payment, verify_payments_batch
+from .models import QueuedVerification, SUPPORTED_PROVIDERS
+
+TRENDING_LIMIT = 50
+SEARCH_MAX_LIMIT = 50
+CONTESTANT_BATCH_LIMIT = 100
+RETRY_AFTER_SECONDS = 30
 
 # This view handles the creation of events by organizers.
 class EventCreateView(CreateAPIView):
@@ -41,7 +63,7 @@ class EventCreateView(CreateAPIView):
 
 class EventListView(ListAPIView):
     serializer_class = EventSerializer
-    permission_classes = [AllowAny]
+    permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         return Event.objects.filter(organizer=self.request.user)
@@ -60,9 +82,43 @@ class EventListView(ListAPIView):
         }, status=status.HTTP_200_OK)
 
 
+class TrendingEventListView(ListAPIView):
+    serializer_class = TrendingEventSerializer
+    permission_classes = [AllowAny]
+
+    def get_queryset(self):
+        now = timezone.now()
+        return (
+            Event.objects.filter(start_date__lte=now, end_date__gte=now)
+            .select_related('organizer')
+            .annotate(
+                score=Coalesce('trending__score', Value(0.0)),
+                recent_votes=Coalesce('trending__recent_votes', Value(0)),
+            )
+            .order_by('-score', 'end_date')
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Discover live events",
+        operation_description=(
+            "Public list of events whose voting window is open, ranked by recent vote velocity. "
+            "Scores are precomputed by `manage.py compute_trending`."
+        ),
+        tags=["organizer"]
+    )
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()[:TRENDING_LIMIT]
+        serializer = self.get_serializer(queryset, many=True)
+        return Response({
+            "message": "Live events retrieved successfully.",
+            "events": serializer.data
+        }, status=status.HTTP_200_OK)
+
+
 class EventDetailView(RetrieveAPIView):
-    queryset = Event.objects.all()
+    queryset = Event.objects.select_related('organizer').prefetch_related('contestants')
     serializer_class = EventSerializer
+    lookup_field = 'event_id'
     permission_classes = [AllowAny]
 
     @swagger_auto_schema(
@@ -70,12 +126,14 @@ class EventDetailView(RetrieveAPIView):
         operation_description="Anyone can view details of a specific event by ID.",
         tags=["organizer"]
     )
-    def get(self, request, *args, **kwargs):
-        event = self.get_object()
-        serializer = self.get_serializer(event)
+    def get(self, request, event_id, *args, **kwargs):
+        event_pk = event_pk_for(event_id)
+        if event_pk is None:
+            raise Http404
+        data = get_event_cached(event_pk, 'detail', lambda: self.get_serializer(self.get_object()).data)
         return Response({
             "message": "Event retrieved successfully.",
-            "event": serializer.data
+            "event": data
         }, status=status.HTTP_200_OK)
     
 
@@ -83,6 +141,7 @@ class EventDetailView(RetrieveAPIView):
 class EventUpdateDeleteView(RetrieveUpdateDestroyAPIView):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
+    lookup_field = 'event_id'
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
@@ -91,6 +150,11 @@ class EventUpdateDeleteView(RetrieveUpdateDestroyAPIView):
             raise PermissionDenied("You are not authorized to modify this event.")
         return obj
 
+    def perform_destroy(self, instance):
+        # Cascading millions of votes inside the request would time out; the
+        # rows are removed later by the purge_deleted_events command.
+        soft_delete_event(instance)
+
     @swagger_auto_schema(
         operation_summary="Update an event",
         operation_description="Allows the organizer to update their event.",
@@ -115,6 +179,147 @@ class EventUpdateDeleteView(RetrieveUpdateDestroyAPIView):
             "message": "Event deleted successfully."
         }, status=status.HTTP_204_NO_CONTENT)
 
+class EventResultsView(APIView):
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        operation_summary="Event results",
+        operation_description=(
+            "Live standings while voting is open. Once the event has ended the final results "
+            "are snapshotted once and served from that snapshot."
+        ),
+        tags=["organizer"]
+    )
+    def get(self, request, event_id, *args, **kwargs):
+        payload = get_final_results(event_id)
+        finalized = payload is not None
+        if not finalized:
+            event = get_object_or_404(Event, event_id=event_id)
+            payload, finalized = get_results(event)
+
+        return Response({
+            "message": "Results retrieved successfully.",
+            "finalized": finalized,
+            "results": payload
+        }, status=status.HTTP_200_OK)
+
+class SearchView(APIView):
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        operation_summary="Search events and contestants",
+        operation_description="Prefix search over event and contestant names, best matches first.",
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('type', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=['contestant', 'event']),
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+        tags=["organizer"]
+    )
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        kind = request.query_params.get("type") or None
+        if not query:
+            return Response({"message": "q is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if kind not in (None, 'contestant', 'event'):
+            return Response({"message": "type must be 'contestant' or 'event'."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get("limit", 20)), SEARCH_MAX_LIMIT)
+        except ValueError:
+            return Response({"message": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "message": "Search results retrieved successfully.",
+            "results": search(query, kind=kind, limit=max(limit, 1))
+        }, status=status.HTTP_200_OK)
+
+class EventDashboardView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Event dashboard",
+        operation_description=(
+            "Totals for the organizer's event: votes, revenue, payment outcomes by provider, "
+            "per-contestant totals and the last-hour vote rate. Cached for a few seconds."
+        ),
+        tags=["organizer"]
+    )
+    def get(self, request, event_id, *args, **kwargs):
+        event = get_object_or_404(Event.objects.select_related('archive'), event_id=event_id)
+        if event.organizer_id != request.user.pk:
+            raise PermissionDenied("You are not authorized to view this dashboard.")
+        return Response({
+            "message": "Dashboard retrieved successfully.",
+            "dashboard": get_dashboard(event)
+        }, status=status.HTTP_200_OK)
+
+
+class OrganizerBatchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        request_body=OrganizerBatchRequestSerializer,
+        operation_summary="Run several organizer requests at once",
+        operation_description=(
+            f"Runs up to {ORGANIZER_BATCH_LIMIT} requests against /api/organizer/ routes (payments excepted) "
+            "in order, authenticated once. Each result has the status and body the route would have returned. "
+            "With atomic=true they share one transaction: the first failing request rolls back all of them "
+            "and the batch answers 400 with its index."
+        ),
+        tags=["organizer"]
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = OrganizerBatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results, failed_index = run_batch(request, serializer.validated_data["requests"], serializer.validated_data["atomic"])
+        if failed_index is not None:
+            return Response({
+                "message": f"Request {failed_index} failed; the batch was rolled back.",
+                "failed_index": failed_index,
+                "results": results
+            }, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            "message": "Batch completed.",
+            "results": results
+        }, status=status.HTTP_200_OK)
+
+
+class EventVoteAuditView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get_event(self, request, event_id):
+        event = get_object_or_404(Event, event_id=event_id)
+        if event.organizer != request.user:
+            raise PermissionDenied("You are not authorized to audit this event.")
+        return event
+
+    @swagger_auto_schema(
+        operation_summary="Audit vote tallies",
+        operation_description="Lists contestants whose stored vote_count differs from the sum of their votes.",
+        tags=["organizer"]
+    )
+    def get(self, request, event_id, *args, **kwargs):
+        drift = find_drift(self.get_event(request, event_id))
+        return Response({
+            "message": "Vote audit completed.",
+            "drifted": len(drift),
+            "contestants": drift
+        }, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_summary="Fix vote tallies",
+        operation_description="Recounts drifted contestants from their votes in one bulk update.",
+        tags=["organizer"]
+    )
+    def post(self, request, event_id, *args, **kwargs):
+        drift = find_drift(self.get_event(request, event_id))
+        fixed = fix_drift(drift)
+        return Response({
+            "message": "Vote tallies recounted.",
+            "fixed": fixed,
+            "contestants": drift
+        }, status=status.HTTP_200_OK)
+
 # # Contestant Views
 
 class ContestantCreateView(CreateAPIView):
@@ -128,7 +333,10 @@ class ContestantCreateView(CreateAPIView):
     )
     def create(self, request, *args, **kwargs):
         event_id = request.data.get("event")
-        event = Event.objects.get(event_id=event_id)
+        try:
+            event = Event.objects.get(event_id=event_id)
+        except (Event.DoesNotExist, DjangoValidationError):
+            return Response({"message": "Invalid event."}, status=status.HTTP_400_BAD_REQUEST)
 
         if event.organizer != request.user:
             raise PermissionDenied("You are not authorized to add contestants to this event.")
@@ -148,24 +356,28 @@ class ContestantListView(ListAPIView):
     permission_classes = [AllowAny]
 
     def get_queryset(self):
-        return Contestant.objects.filter(event__id=self.kwargs['event_id'])
+        return Contestant.objects.filter(
+            event__id=self.kwargs['event_id'], event__deleted_at__isnull=True
+        ).select_related('event')
 
     @swagger_auto_schema(
         operation_summary="List contestants for an event",
         operation_description="Anyone can view contestants in a specific event.",
         tags=["organizer"]
     )
-    def get(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+    def get(self, request, event_id, *args, **kwargs):
+        def load():
+            return self.get_serializer(self.get_queryset(), many=True).data
+
+        contestants = get_event_cached(event_id, 'contestants', load) if event_exists(event_id) else []
         return Response({
             "message": "Contestants retrieved successfully.",
-            "contestants": serializer.data
+            "contestants": contestants
         }, status=status.HTTP_200_OK)
 
 
 class ContestantUpdateDeleteView(RetrieveUpdateDestroyAPIView):
-    queryset = Contestant.objects.all()
+    queryset = Contestant.objects.filter(event__deleted_at__isnull=True)
     serializer_class = ContestantSerializer
     permission_classes = [IsAuthenticated]
 
@@ -212,16 +424,49 @@ class VoteCreateView(APIView):
         tags=["Votes"]
     )
     def get(self, request, contestant_id, *args, **kwargs):
-        contestant = get_object_or_404(Contestant, id=contestant_id)
+        card = get_contestant_cards([contestant_id]).get(contestant_id)
+        if card is None:
+            raise Http404
         return Response({
             "message": "Contestant retrieved successfully.",
-            "contestant": {
-                "id": contestant.id,
-                "name": contestant.contestant_name,
-                "bio": contestant.bio,
-                "photo_url": contestant.photo_url,
-                "event": contestant.event.event_name
-            }
+            "contestant": card
+        }, status=status.HTTP_200_OK)
+
+
+class ContestantBatchView(APIView):
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        operation_summary="Get several contestants before voting",
+        operation_description=(
+            f"Returns the same contestant cards as the single lookup for up to {CONTESTANT_BATCH_LIMIT} "
+            "comma-separated IDs, in the order requested."
+        ),
+        manual_parameters=[
+            openapi.Parameter('ids', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True,
+                              description="Comma-separated contestant IDs, e.g. 4,5,9"),
+        ],
+        tags=["Votes"]
+    )
+    def get(self, request, *args, **kwargs):
+        try:
+            ids = [int(value) for value in request.query_params.get("ids", "").split(",") if value.strip()]
+        except ValueError:
+            return Response({"message": "ids must be comma-separated integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return Response({"message": "ids is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > CONTESTANT_BATCH_LIMIT:
+            return Response({
+                "message": f"At most {CONTESTANT_BATCH_LIMIT} contestants can be requested at once."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        cards = get_contestant_cards(ids)
+        return Response({
+            "message": "Contestants retrieved successfully.",
+            "contestants": [cards[pk] for pk in ids if pk in cards],
+            "missing": [pk for pk in ids if pk not in cards]
         }, status=status.HTTP_200_OK)
 
 
@@ -231,8 +476,6 @@ from .serializers import PaystackInitRequestSerializer
 class PaystackInitPaymentView(APIView):
     permission_classes = [AllowAny]
 
-    SUPPORTED_PROVIDERS = ['mtn', 'vodafone', 'airteltigo']
-
     @swagger_auto_schema(
         request_body=PaystackInitRequestSerializer,
         operation_summary="Initiate Mobile Money payment via Paystack",
@@ -251,15 +494,17 @@ class PaystackInitPaymentView(APIView):
                     }
                 }
             ),
-            400: "Missing phone_number, quantity, contestant_id, or provider.",
-            502: "Failed to initiate payment with Paystack."
+            400: "Missing phone_number, quantity, contestant_id, or provider, or quantity is not a positive integer.",
+            403: "The event is not open for paid voting.",
+            502: "Paystack rejected the payment initialization.",
+            503: "Paystack is unavailable or its circuit breaker is open; retry after the Retry-After delay."
         },
         tags=["Payments"]
     )
 
     def post(self, request, *args, **kwargs):
         phone = request.data.get("phone_number")
-        quantity = int(request.data.get("quantity", 1))
+        quantity = request.data.get("quantity", 1)
         contestant_id = request.data.get("contestant_id")
         provider = request.data.get("provider", "").lower()
 
@@ -268,55 +513,39 @@ class PaystackInitPaymentView(APIView):
                 "message": "phone_number, quantity, contestant_id, and provider are required."
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        if provider not in self.SUPPORTED_PROVIDERS:
+        if provider not in SUPPORTED_PROVIDERS:
             return Response({
-                "message": f"Invalid provider. Supported: {', '.join(self.SUPPORTED_PROVIDERS)}"
+                "message": f"Invalid provider. Supported: {', '.join(SUPPORTED_PROVIDERS)}"
             }, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            contestant = Contestant.objects.select_related('event').get(id=contestant_id)
-        except Contestant.DoesNotExist:
-            return Response({"message": "Invalid contestant."}, status=status.HTTP_404_NOT_FOUND)
-
-        price_per_vote = contestant.event.price_per_vote or 0
-        amount_kobo = int(price_per_vote * quantity * 100)
-
-        headers = {
-            "Authorization": f"Bearer {settings.PAYSTACK_SECRET_KEY}",
-            "Content-Type": "application/json",
-        }
+            quantity = int(quantity)
+        except (TypeError, ValueError):
+            quantity = 0
+        if quantity < 1:
+            return Response({"message": "quantity must be a positive integer."}, status=status.HTTP_400_BAD_REQUEST)
 
-        email = f"{phone}@votemomo.app"  # synthetic email for Paystack
-
-        data = {
-            "email": email,
-            "amount": amount_kobo,
-            "channels": ["mobile_money"],
-            "mobile_money": {
-                "phone": phone,
-                "provider": provider
-            },
-            "metadata": {
-                "contestant_id": contestant_id,
-                "quantity": quantity,
-                "phone_number": phone,
-                "provider": provider
-            }
-        }
-
-        response = requests.post("https://api.paystack.co/transaction/initialize",
-                                 json=data, headers=headers)
+        try:
+            contestant_id = int(contestant_id)
+        except (TypeError, ValueError):
+            return Response({"message": "Invalid contestant."}, status=status.HTTP_404_NOT_FOUND)
 
-        if response.status_code != 200:
+        try:
+            result = initialize_payment(contestant_id, phone, quantity, provider)
+        except paystack.PaystackUnavailable as exc:
+            # Covers the open breaker as well as timeouts and Paystack 5xx answers.
+            return Response({"message": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+        except PaymentError as exc:
             return Response({
-                "message": "Failed to initiate payment.",
-                "details": response.json()
-            }, status=status.HTTP_502_BAD_GATEWAY)
+                "message": exc.message,
+                "details": exc.details
+            }, status=exc.status_code)
 
         return Response({
             "message": "Mobile Money payment initialized successfully.",
-            "payment_url": response.json().get("data", {}).get("authorization_url"),
-            "reference": response.json().get("data", {}).get("reference")
+            "payment_url": result["authorization_url"],
+            "reference": result["reference"]
         }, status=status.HTTP_200_OK)
 
 
@@ -338,11 +567,14 @@ class PaystackVerifyPaymentView(APIView):
                             "contestant": "Michael Adu",
                             "quantity": 3,
                             "timestamp": "2025-06-01T12:00:00Z"
-                        }
+                        },
+                        "receipt": "eyJyIjoidHhuX3JlZl8wMDEiLCJjIjo1LCJxIjozLCJ0IjoxNzQ4Nzc5MjAwfQ:1uL...:Qm9..."
                     }
                 }
             ),
+            202: "Paystack is unavailable; verification queued for later settlement.",
             409: "Payment already verified.",
+            403: "The payment was made outside the event's voting window.",
             400: "Invalid or missing reference."
         },
         tags=["Payments"]
@@ -353,65 +585,103 @@ class PaystackVerifyPaymentView(APIView):
         if not reference:
             return Response({"message": "Reference is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        headers = {
-            "Authorization": f"Bearer {settings.PAYSTACK_SECRET_KEY}",
-            "Content-Type": "application/json"
-        }
+        voter_ip = request.META.get("REMOTE_ADDR")
+        try:
+            payment, vote = verify_payment(reference, voter_ip)
+        except paystack.PaystackUnavailable:
+            # Degraded mode: accept the reference now and settle it once Paystack recovers.
+            queue_verification(reference, voter_ip)
+            return Response({
+                "message": "Payment verification has been queued and the vote will be recorded shortly.",
+                "reference": reference
+            }, status=status.HTTP_202_ACCEPTED)
+        except PaymentError as exc:
+            body = {"message": exc.message}
+            if exc.details is not None:
+                body["details"] = exc.details
+            return Response(body, status=exc.status_code)
 
-        url = f"https://api.paystack.co/transaction/verify/{reference}"
-        response = requests.get(url, headers=headers)
-        result = response.json()
+        return Response({
+            "message": "Payment verified and vote recorded successfully.",
+            "vote": {
+                "contestant": payment.contestant.contestant_name,
+                "quantity": vote.quantity,
+                "timestamp": vote.timestamp
+            },
+            "receipt": receipt_for(payment, vote)
+        }, status=status.HTTP_201_CREATED)
 
-        if response.status_code != 200 or not result.get("status"):
-            return Response({
-                "message": "Verification failed.",
-                "details": result
-            }, status=status.HTTP_400_BAD_REQUEST)
 
-        data = result["data"]
-        if data["status"] != "success":
-            return Response({"message": "Payment not successful."}, status=status.HTTP_402_PAYMENT_REQUIRED)
+class PaystackBatchVerifyPaymentView(APIView):
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        request_body=PaystackBatchVerifyRequestSerializer,
+        operation_summary="Verify several Paystack payments",
+        operation_description=(
+            f"Verifies up to {PAYMENT_BATCH_VERIFY_LIMIT} references at once. References already settled are "
+            "skipped, the rest are checked against Paystack concurrently and all votes are recorded together. "
+            "Each reference gets its own status: recorded, already_verified, failed or queued."
+        ),
+        tags=["Payments"]
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = PaystackBatchVerifyRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = verify_payments_batch(serializer.validated_data["references"], request.META.get("REMOTE_ADDR"))
+        return Response({
+            "message": "Payments processed.",
+            "results": results
+        }, status=status.HTTP_200_OK)
 
-        # Get metadata
-        metadata = data.get("metadata", {})
-        timestamp = data.get("paid_at")
-        contestant_id = metadata.get("contestant_id")
-        quantity = int(metadata.get("quantity", 1))
-        ip = request.META.get("REMOTE_ADDR")
-        phone_number = metadata.get("phone_number")
-        provider = metadata.get("provider")
 
+class ReceiptCheckView(APIView):
+    # Signature check only: no authentication and no database access, so
+    # dispute traffic after a show never reaches the database.
+    authentication_classes = []
+    permission_classes = [AllowAny]
 
+    @swagger_auto_schema(
+        operation_summary="Check a vote receipt",
+        operation_description=(
+            "Validates a receipt returned by payment verification and decodes the vote it "
+            "proves: reference, contestant, quantity and time."
+        ),
+        manual_parameters=[
+            openapi.Parameter('receipt', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True)
+        ],
+        tags=["Payments"]
+    )
+    def get(self, request, *args, **kwargs):
+        token = request.query_params.get("receipt", "").strip()
+        if not token:
+            return Response({"message": "receipt is required."}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            contestant = Contestant.objects.select_related('event').get(id=contestant_id)
-        except Contestant.DoesNotExist:
-            return Response({"message": "Invalid contestant."}, status=status.HTTP_404_NOT_FOUND)
+            vote = check_receipt(token)
+        except InvalidReceipt as exc:
+            return Response({"message": str(exc), "valid": False}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            "message": "Receipt is valid.",
+            "valid": True,
+            "vote": vote
+        }, status=status.HTTP_200_OK)
 
-        # Create Vote
-        vote = Vote.objects.create(
-            contestant=contestant,
-            timestamp = timestamp,
-            voter_ip=ip,
-            quantity=quantity,
-        )
 
-        # Create Payment record
-        Payment.objects.create(
-            vote=vote,
-            amount=(data["amount"] / 100),
-            quantity=quantity,
-            reference=reference,
-            phone_number=phone_number,
-            provider=provider,
-            status=data["status"],
-            paid_at=datetime.strptime(data["paid_at"], "%Y-%m-%dT%H:%M:%S.%fZ")
-        )
+class HasMetricsToken(BasePermission):
+    def has_permission(self, request, view):
+        token = getattr(settings, 'METRICS_TOKEN', '')
+        supplied = request.META.get('HTTP_AUTHORIZATION', '')
+        # compare_digest only accepts ASCII str, so compare the encoded bytes.
+        return bool(token) and hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode())
 
-        return Response({
-            "message": "Payment verified and vote recorded successfully.",
-            "vote": {
-                "contestant": contestant.contestant_name,
-                "quantity": vote.quantity,
-                "timestamp": vote.timestamp
-            }
-        }, status=status.HTTP_201_CREATED)
+
+# Prometheus scrape endpoint. It is guarded by a static bearer token instead of
+# user auth so scrapers do not need an account.
+class MetricsView(APIView):
+    authentication_classes = []
+    permission_classes = [HasMetricsToken]
+    swagger_schema = None
+
+    def get(self, request, *args, **kwargs):
+        registry.set_gauge('evote_verification_queue_depth', (), QueuedVerification.objects.count())
+        return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,81 @@
+import threading
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+
+from .models import Contestant
+
+VOTING_PARAMS_TTL = 60
+VOTING_PARAMS_MAX_ENTRIES = 10000
+
+
+class VotingParams(NamedTuple):
+    event_pk: int
+    vote_type: str
+    start_date: object
+    end_date: object
+    price_per_vote: object
+
+
+# Per-process cache of what the payment path needs to know about an event,
+# keyed by contestant. Saves in this process drop entries immediately (see
+# signals.py); other workers pick up changes within VOTING_PARAMS_TTL seconds.
+_lock = threading.Lock()
+_params = {}
+_contestant_events = {}
+
+
+def _ttl():
+    return getattr(settings, 'VOTING_PARAMS_TTL', VOTING_PARAMS_TTL)
+
+
+def get_voting_params(contestant_id):
+    now = time.monotonic()
+    with _lock:
+        event_pk = _contestant_events.get(contestant_id)
+        entry = _params.get(event_pk)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    row = (
+        Contestant.objects.filter(pk=contestant_id, event__deleted_at__isnull=True)
+        .values('event_id', 'event__vote_type', 'event__start_date', 'event__end_date', 'event__price_per_vote')
+        .first()
+    )
+    if row is None:
+        return None
+    params = VotingParams(
+        event_pk=row['event_id'],
+        vote_type=row['event__vote_type'],
+        start_date=row['event__start_date'],
+        end_date=row['event__end_date'],
+        price_per_vote=row['event__price_per_vote'],
+    )
+    with _lock:
+        if len(_params) >= VOTING_PARAMS_MAX_ENTRIES or len(_contestant_events) >= VOTING_PARAMS_MAX_ENTRIES:
+            _params.clear()
+            _contestant_events.clear()
+        _contestant_events[contestant_id] = params.event_pk
+        _params[params.event_pk] = (now + _ttl(), params)
+    return params
+
+
+def invalidate_event(event_pk):
+    with _lock:
+        _params.pop(event_pk, None)
+
+
+def invalidate_contestant(contestant_id):
+    with _lock:
+        _contestant_events.pop(contestant_id, None)
+
+
+def voting_closed_reason(params, at):
+    if params.vote_type != 'paid':
+        return "This event does not accept paid votes."
+    if at < params.start_date:
+        return "Voting for this event has not opened yet."
+    if at > params.end_date:
+        return "Voting for this event has closed."
+    return None
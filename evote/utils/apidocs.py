@@ -0,0 +1,27 @@
+from django.conf import settings
+
+# Views import swagger_auto_schema and openapi from here. With API_DOCS_ENABLED
+# off, drf_yasg is never imported: the decorator leaves views untouched and
+# `openapi` only has to accept the arguments the decorators are written with.
+if getattr(settings, 'API_DOCS_ENABLED', True):
+    from drf_yasg import openapi
+    from drf_yasg.utils import swagger_auto_schema
+else:
+    class _Spec:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    class openapi:
+        IN_QUERY = 'query'
+        IN_PATH = 'path'
+        IN_HEADER = 'header'
+        TYPE_OBJECT = 'object'
+        TYPE_STRING = 'string'
+        TYPE_INTEGER = 'integer'
+        TYPE_NUMBER = 'number'
+        TYPE_BOOLEAN = 'boolean'
+        TYPE_ARRAY = 'array'
+        Parameter = Response = Schema = Items = _Spec
+
+    def swagger_auto_schema(*args, **kwargs):
+        return lambda view: view
@@ -1,4 +1,4 @@
 import uuid
 
 def generate_ids():
-    return str(uuid.uuid4())
+    return uuid.uuid4()
@@ -0,0 +1,38 @@
+import uuid
+
+from django.db import transaction
+
+BATCH_SIZE = 2000
+
+
+def _as_uuid(model, pk, source, value):
+    # A made-up UUID would silently cut the row off from everything that
+    # refers to its old id, so a bad value stops the migration instead.
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        raise ValueError(
+            f"{model.__name__} pk={pk}: {source}={value!r} is not a UUID; fix the row and run the migration again."
+        ) from None
+
+
+def copy_uuid_column(apps, schema_editor, app_label, model_name, source, target, batch_size=BATCH_SIZE):
+    # Copies string UUIDs into a native UUID column in primary-key batches.
+    # Each batch commits on its own and only unconverted rows are picked up,
+    # so an interrupted run can simply be restarted.
+    model = apps.get_model(app_label, model_name)
+    db = schema_editor.connection.alias
+    manager = model._base_manager.db_manager(db)
+    last_pk = 0
+    while True:
+        rows = list(
+            manager.filter(pk__gt=last_pk, **{f'{target}__isnull': True})
+            .order_by('pk')
+            .values_list('pk', source)[:batch_size]
+        )
+        if not rows:
+            return
+        converted = [model(pk=pk, **{target: _as_uuid(model, pk, source, value)}) for pk, value in rows]
+        with transaction.atomic(using=db):
+            manager.bulk_update(converted, [target])
+        last_pk = rows[-1][0]